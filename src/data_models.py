@@ -22,6 +22,7 @@ Dependencies: Pydantic for validation, Pandas for CSV loading
 """
 
 from typing import Optional, List, Dict, Any, Literal
+from dataclasses import dataclass
 from pydantic import BaseModel, Field, validator, root_validator
 from datetime import datetime, date
 from enum import Enum
@@ -173,6 +174,23 @@ class CourseWeight(BaseModel):
         use_enum_values = True
 
 
+@dataclass(frozen=True, slots=True)
+class WeightInfo:
+    """
+    Lightweight weight info read by the GPA calculator and templates
+
+    Same attributes as CourseWeight, for courses built outside the weight
+    index (unindexed and middle school courses). Immutable, so one instance
+    can be shared by every course it describes.
+    """
+
+    credit: float
+    weight: float = 0.0
+    is_ap: bool = False
+    is_honors: bool = False
+    core: bool = False
+
+
 class CourseGrade(BaseModel):
     """Individual course grade record"""
 
@@ -434,6 +452,7 @@ __all__ = [
     'LetterGrade',
     'StudentDetails',
     'CourseWeight',
+    'WeightInfo',
     'CourseGrade',
     'TransferGrade',
     'GPACalculation',
@@ -24,7 +24,7 @@ import sys
 import pandas as pd
 import numpy as np
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, List, Optional, Tuple, Any, Callable
 from dataclasses import dataclass
 from datetime import datetime
 import logging
@@ -177,12 +177,31 @@ class TranscriptDataProcessor:
         # Pre-calculated GPA results for all students
         self.gpa_results: Dict[int, Any] = {}  # user_id -> GPACalculation
 
+        # Decile rankings per graduation year, computed on first use by the
+        # template builders and reset whenever GPAs are recalculated
+        self.decile_rankings_by_grad_year: Dict[int, Dict[int, Any]] = {}
+
+        # Distinct course codes per student (class rank tie-breaking input)
+        self.course_counts_by_user: Dict[int, int] = {}
+
+        # Per-table lookup key -> row positions, built lazily by _indexed_rows()
+        self._row_index: Dict[str, Tuple[pd.DataFrame, Dict[Any, Any]]] = {}
+
         # Validation results
         self.validation_errors: List[str] = []
         self.validation_warnings: List[str] = []
 
-    def load_all_data(self) -> bool:
-        """Load all CSV data sources with validation"""
+    def load_all_data(self, calculate_gpas: bool = True) -> bool:
+        """
+        Load all CSV data sources with validation
+
+        Args:
+            calculate_gpas: Pre-calculate every student's GPA into gpa_results
+                (callers that already hold the results can skip it)
+
+        Returns:
+            True if every required source loaded
+        """
 
         logger.info("🔍 LOADING TRANSCRIPT DATA SOURCES")
         logger.info("=" * 60)
@@ -210,7 +229,8 @@ class TranscriptDataProcessor:
             logger.info("✅ All data sources loaded successfully")
             self._perform_cross_validation()
             # Pre-calculate GPAs for all students
-            self._calculate_all_student_gpas()
+            if calculate_gpas:
+                self._calculate_all_student_gpas()
         else:
             logger.error("❌ Data loading failed - check validation errors")
 
@@ -384,6 +404,11 @@ class TranscriptDataProcessor:
             # Clean titles (remove suffix)
             self.grades["Course Title"] = self.grades["Course Title"].str.replace(honors_pattern, "", regex=True)
 
+            # One groupby instead of a per-student filter when ranking classes
+            self.course_counts_by_user = (
+                self.grades.groupby("User ID")["Course Code"].nunique().to_dict()
+            )
+
             logger.info(f"  ✅ Loaded {len(self.grades)} grade records")
             logger.info(f"  ✨ Detected {mask.sum()} honors courses via title scan")
             return True
@@ -924,6 +949,40 @@ class TranscriptDataProcessor:
                 f"  Missing weight mappings for: {list(missing_weights)[:10]}..."
             )  # Show first 10
 
+    def _indexed_rows(
+        self,
+        name: str,
+        frame: pd.DataFrame,
+        index_keys: Callable[[pd.DataFrame], Any],
+        key: Any,
+    ) -> pd.DataFrame:
+        """
+        Rows of a table whose lookup key equals ``key`` (may be empty)
+
+        The table is grouped by its lookup key once and the row positions
+        reused, instead of a full boolean scan per student. The index is
+        rebuilt whenever a new frame is swapped in (e.g. load_all_data).
+        Rows whose key contains NaN never match, as with the boolean scan.
+
+        Args:
+            name: Cache slot for this table/key combination
+            frame: Table to look up rows in
+            index_keys: Builds the groupby key(s) for every row of ``frame``
+            key: Lookup key (a tuple for multi-column keys)
+
+        Returns:
+            Matching rows of ``frame`` in their original order
+        """
+        cached = self._row_index.get(name)
+        if cached is None or cached[0] is not frame:
+            cached = (frame, frame.groupby(index_keys(frame), sort=False).indices)
+            self._row_index[name] = cached
+
+        positions = cached[1].get(key)
+        if positions is None:
+            return frame.iloc[:0]
+        return frame.iloc[positions]
+
     def get_ap_scores_for_student(
         self, first_name: str, last_name: str
     ) -> Dict[str, Any]:
@@ -935,16 +994,15 @@ class TranscriptDataProcessor:
             return {"exams": [], "awards": []}
 
         # Match student by name
-        student_row = self.ap_scores[
-            (
-                self.ap_scores["First Name"].str.strip().str.lower()
-                == first_name.strip().lower()
-            )
-            & (
-                self.ap_scores["Last Name"].str.strip().str.lower()
-                == last_name.strip().lower()
-            )
-        ]
+        student_row = self._indexed_rows(
+            "ap_scores",
+            self.ap_scores,
+            lambda df: [
+                df["First Name"].str.strip().str.lower(),
+                df["Last Name"].str.strip().str.lower(),
+            ],
+            (first_name.strip().lower(), last_name.strip().lower()),
+        )
 
         if student_row.empty:
             return {"exams": [], "awards": []}
@@ -1046,9 +1104,12 @@ class TranscriptDataProcessor:
             return None
 
         # Match student by School Student ID
-        student_tests = self.sat_scores[
-            self.sat_scores["School Student ID"].astype(str) == str(student_id)
-        ]
+        student_tests = self._indexed_rows(
+            "sat_scores",
+            self.sat_scores,
+            lambda df: df["School Student ID"].astype(str),
+            str(student_id),
+        )
 
         if student_tests.empty:
             return None
@@ -1101,10 +1162,15 @@ class TranscriptDataProcessor:
             return None
 
         # Match student by name (ACT data uses Last Name, First Name)
-        student_tests = self.act_scores[
-            (self.act_scores["First Name"].str.strip().str.upper() == first_name.strip().upper())
-            & (self.act_scores["Last Name"].str.strip().str.upper() == last_name.strip().upper())
-        ]
+        student_tests = self._indexed_rows(
+            "act_scores",
+            self.act_scores,
+            lambda df: [
+                df["First Name"].str.strip().str.upper(),
+                df["Last Name"].str.strip().str.upper(),
+            ],
+            (first_name.strip().upper(), last_name.strip().upper()),
+        )
 
         if student_tests.empty:
             return None
@@ -1154,24 +1220,24 @@ class TranscriptDataProcessor:
         if self.sports is None or self.sports.empty:
             return []
 
-        # First filter out rows with NaN Grad Year
-        valid_sports = self.sports[self.sports["Grad Year"].notna()].copy()
-
-        # Convert Grad Year to int on the filtered data
-        valid_sports["Grad Year"] = valid_sports["Grad Year"].astype(int)
+        def sports_keys(df: pd.DataFrame) -> List[pd.Series]:
+            # Rows with NaN Grad Year are left unkeyed; the rest compare as int
+            valid = df["Grad Year"].notna()
+            grad_years = pd.Series(None, index=df.index, dtype=object)
+            grad_years[valid] = df.loc[valid, "Grad Year"].astype(int)
+            return [
+                df["First Name"].str.strip().str.lower(),
+                df["Last Name"].str.strip().str.lower(),
+                grad_years,
+            ]
 
-        # Now match student by First Name, Last Name, and Grad Year
-        student_sports = valid_sports[
-            (
-                valid_sports["First Name"].str.strip().str.lower()
-                == first_name.strip().lower()
-            )
-            & (
-                valid_sports["Last Name"].str.strip().str.lower()
-                == last_name.strip().lower()
-            )
-            & (valid_sports["Grad Year"] == grad_year)
-        ]
+        # Match student by First Name, Last Name, and Grad Year
+        student_sports = self._indexed_rows(
+            "sports",
+            self.sports,
+            sports_keys,
+            (first_name.strip().lower(), last_name.strip().lower(), grad_year),
+        )
 
         if student_sports.empty:
             return []
@@ -1197,9 +1263,12 @@ class TranscriptDataProcessor:
             return []
 
         # Match student by User ID
-        student_courses = self.courses_in_progress[
-            self.courses_in_progress["User ID"].astype(str) == str(user_id)
-        ]
+        student_courses = self._indexed_rows(
+            "courses_in_progress",
+            self.courses_in_progress,
+            lambda df: df["User ID"].astype(str),
+            str(user_id),
+        )
 
         if student_courses.empty:
             return []
@@ -1218,6 +1287,24 @@ class TranscriptDataProcessor:
 
         return courses_list
 
+    def get_transfer_grades_for_student(self, user_id: str) -> pd.DataFrame:
+        """Transfer grade rows for a student, matched on User ID as text"""
+        return self._indexed_rows(
+            "transfer_grades",
+            self.transfer_grades,
+            lambda df: df["User ID"].astype(str),
+            str(user_id),
+        )
+
+    def get_students_in_graduation_year(self, grad_year: int) -> pd.DataFrame:
+        """Student details rows for one graduating class"""
+        return self._indexed_rows(
+            "student_details_by_grad_year",
+            self.student_details,
+            lambda df: df["Graduation year"],
+            grad_year,
+        )
+
     def get_student_record(self, user_id: str) -> Optional[StudentRecord]:
         """Assemble complete student record from all data sources"""
 
@@ -1239,9 +1326,9 @@ class TranscriptDataProcessor:
         ].to_dict("records")
 
         # Get transfer grades
-        transfer_grades = self.transfer_grades[
-            self.transfer_grades["User ID"].astype(str) == str(user_id)
-        ].to_dict("records")
+        transfer_grades = self.get_transfer_grades_for_student(user_id).to_dict(
+            "records"
+        )
 
         # Create student record
         return StudentRecord(
@@ -1348,6 +1435,7 @@ class TranscriptDataProcessor:
         Only processes full-time students (>4 courses).
         """
         logger.info("📊 Pre-calculating GPAs for all students from merged dataset...")
+        self.decile_rankings_by_grad_year = {}
 
         # Import merged GPA calculator
         try:
@@ -30,9 +30,17 @@ Dependencies: data_models.py for type definitions
 """
 
 from typing import Dict, List, Optional, Tuple
+from bisect import bisect_right
 from dataclasses import dataclass
+from functools import lru_cache
+from operator import attrgetter
 from datetime import datetime
 import logging
+import math
+import numpy as np
+
+# JIT compilation for bulk GPA runs (optional - falls back to plain Python)
+from numba_compat import njit, prange
 
 # Import data models
 from data_models import CourseGrade, CourseWeight, GPACalculation, TransferGrade
@@ -50,22 +58,240 @@ GRADE_POINTS = {
     "F": 0.0,
 }
 
+# Compact int8 grade codes: index into GRADE_POINTS; NO_GRADE_CODE = not in GPA
+GRADE_CODES = {letter: code for code, letter in enumerate(GRADE_POINTS)}
+GRADE_POINT_CODES = {points: code for code, points in enumerate(GRADE_POINTS.values())}
+GRADE_POINTS_LUT = np.array(list(GRADE_POINTS.values()))
+GRADE_PASSING_LUT = GRADE_POINTS_LUT > 0.0
+NO_GRADE_CODE = -1
+
 # Grades that don't count in GPA
 NON_GPA_GRADES = {"P", "NP", "I", "W", "Pass", "Fail", "Incomplete", "Withdrawn"}
 
+# Blank/withdrawn grades (uppercased) - no credit attempted, skipped everywhere
+BLANK_GRADES = frozenset({"W", "WITHDRAWN", "—", "", "NONE", "NAN"})
+
+# Numeric (0-100) to letter grade scale: a grade >= THRESHOLDS[i] earns LETTERS[i + 1]
+NUMERIC_GRADE_THRESHOLDS = (60, 63, 67, 70, 73, 77, 80, 83, 87, 90, 93)
+NUMERIC_GRADE_LETTERS = (
+    "F",
+    "D-",
+    "D",
+    "D+",
+    "C-",
+    "C",
+    "C+",
+    "B-",
+    "B",
+    "B+",
+    "A-",
+    "A",
+)
+
+
+def _numeric_to_letter(numeric_grade: float) -> str:
+    """Convert numeric grade (0-100) to letter grade"""
+    if math.isnan(numeric_grade):
+        return "F"
+    return NUMERIC_GRADE_LETTERS[bisect_right(NUMERIC_GRADE_THRESHOLDS, numeric_grade)]
+
+
+@lru_cache(maxsize=256)
+def _lookup_grade_points(grade: str) -> Tuple[Optional[float], bool]:
+    """
+    Convert letter grade to grade points (memoized - grades repeat heavily)
+
+    Args:
+        grade: Letter grade (A, B+, C-, etc.) or numeric grade
+
+    Returns:
+        Tuple of (grade points or None if non-GPA grade, whether the format
+        was recognized). Callers own the unknown-format logging.
+    """
+    # Handle case where grade might be numeric type
+    if isinstance(grade, (int, float)):
+        try:
+            numeric = float(grade)
+            letter_grade = _numeric_to_letter(numeric)
+            return GRADE_POINTS.get(letter_grade, None), True
+        except (ValueError, TypeError):
+            return None, True
+
+    # Convert to string if not already
+    grade_str = str(grade) if not isinstance(grade, str) else grade
+    grade_upper = grade_str.strip().upper()
+
+    # Check if non-GPA grade
+    if grade_upper in NON_GPA_GRADES:
+        return None, True
+
+    # Try direct lookup
+    if grade_upper in GRADE_POINTS:
+        return GRADE_POINTS[grade_upper], True
+
+    # Handle numeric grades (convert to letter)
+    try:
+        numeric = float(grade_str)
+        letter_grade = _numeric_to_letter(numeric)
+        return GRADE_POINTS.get(letter_grade, None), True
+    except ValueError:
+        # Unknown grade format
+        return None, False
+
+
+@lru_cache(maxsize=256)
+def _is_passing_grade(grade: str) -> bool:
+    """Check if grade is passing (memoized)"""
+    grade_upper = grade.strip().upper()
+
+    # Explicit fail grades
+    if grade_upper in ("F", "NP", "FAIL", "W", "WITHDRAWN"):
+        return False
+
+    # Pass grade
+    if grade_upper in ("P", "PASS"):
+        return True
+
+    # Letter grades - F is failing
+    grade_points, _ = _lookup_grade_points(grade)
+    if grade_points is not None:
+        return grade_points > 0.0
+
+    # Unknown - assume passing (conservative)
+    return True
+
+
+@lru_cache(maxsize=1024, typed=True)
+def _classify_grade(grade: str) -> Tuple[str, int, bool]:
+    """
+    Normalize and encode a raw grade in one memoized probe
+
+    The legal grade alphabet is tiny, so after warm-up every row costs a
+    single dict hit instead of strip/upper plus several set/dict lookups.
+
+    Args:
+        grade: Raw grade value as stored on the CourseGrade
+
+    Returns:
+        Tuple of (normalized grade, GRADE_CODES entry or NO_GRADE_CODE,
+        whether the format was recognized)
+    """
+    grade_upper = "" if grade is None else str(grade).strip().upper()
+    if grade_upper in BLANK_GRADES:
+        return grade_upper, NO_GRADE_CODE, True
+
+    grade_code = GRADE_CODES.get(grade_upper)
+    if grade_code is not None:
+        return grade_upper, grade_code, True
+
+    # Numeric and other non-letter grades
+    grade_points, recognized = _lookup_grade_points(grade)
+    if grade_points is None:
+        return grade_upper, NO_GRADE_CODE, recognized
+    return grade_upper, GRADE_POINT_CODES[grade_points], recognized
+
+
+@njit(parallel=True, cache=True)
+def _gpa_batch_kernel(
+    student_offsets: np.ndarray,
+    base_points: np.ndarray,
+    weights: np.ndarray,
+    credits: np.ndarray,
+    core: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Cumulative GPAs for many students packed CSR-style into flat row arrays
+
+    Student i owns rows student_offsets[i]:student_offsets[i + 1]. Rows whose
+    base_points is NaN don't count toward GPA.
+
+    Returns:
+        Tuple of (weighted, unweighted, core_weighted, core_unweighted) arrays
+    """
+    n_students = len(student_offsets) - 1
+    weighted = np.zeros(n_students)
+    unweighted = np.zeros(n_students)
+    core_weighted = np.zeros(n_students)
+    core_unweighted = np.zeros(n_students)
+
+    for s in prange(n_students):
+        w_points = 0.0
+        uw_points = 0.0
+        total_credits = 0.0
+        core_w_points = 0.0
+        core_uw_points = 0.0
+        core_credits = 0.0
+
+        for i in range(student_offsets[s], student_offsets[s + 1]):
+            if np.isnan(base_points[i]):
+                continue
+            credit = credits[i]
+            w_points += (base_points[i] + weights[i]) * credit
+            uw_points += base_points[i] * credit
+            total_credits += credit
+            if core[i]:
+                core_w_points += (base_points[i] + weights[i]) * credit
+                core_uw_points += base_points[i] * credit
+                core_credits += credit
+
+        if total_credits > 0:
+            weighted[s] = w_points / total_credits
+            unweighted[s] = uw_points / total_credits
+        if core_credits > 0:
+            core_weighted[s] = core_w_points / core_credits
+            core_unweighted[s] = core_uw_points / core_credits
+
+    return weighted, unweighted, core_weighted, core_unweighted
+
+
+# Fields read off CourseGrade / CourseWeight once per row during preprocessing
+_GRADE_FIELDS = attrgetter(
+    "course_code",
+    "grade",
+    "school_year",
+    "semester",
+    "credits_attempted",
+    "is_honors_detected",
+)
+_WEIGHT_FIELDS = attrgetter("credit", "weight", "core", "is_ap", "is_honors")
+
+
+@dataclass(slots=True)
+class _CourseRow:
+    """Flattened (grade, weight) pair - plain slot reads instead of model attributes"""
+
+    grade: str
+    grade_upper: str  # Normalized once: stripped, uppercased, "" for None
+    semester_key: str
+    grade_code: int  # GRADE_CODES entry, or NO_GRADE_CODE if not in GPA
+    semester_credit: float  # Explicit credits_attempted, else credit / 2
+    weight: float
+    core: bool
+    is_ap: bool
+    is_honors: bool
+
 
 class GPACalculator:
     """Calculate weighted, unweighted, and CORE GPAs from student course data"""
 
-    def __init__(self, course_weights_index: Dict[str, CourseWeight]):
+    def __init__(
+        self, course_weights_index: Dict[str, CourseWeight], log_enabled: bool = False
+    ):
         """
         Initialize calculator with course weight index
 
         Args:
             course_weights_index: Dictionary mapping course codes to CourseWeight objects
+            log_enabled: Record calculation_log entries (off by default for batches)
         """
         self.course_weights_index = course_weights_index
-        self.calculation_log: List[str] = []
+        self.log_enabled = log_enabled
+        self._log: Optional[List[str]] = None  # Allocated on first entry
+
+        # Each grade row is ONE semester, so the default credit is half the year
+        self._semester_credit: Dict[str, float] = {
+            code: cw.credit * 0.5 for code, cw in course_weights_index.items()
+        }
 
     def calculate_student_gpa(
         self,
@@ -86,11 +312,188 @@ class GPACalculator:
         Returns:
             GPACalculation object with all GPA types and metadata
         """
-        self.calculation_log = []
-        self.calculation_log.append(f"📊 Calculating GPA for Student ID: {student_id}")
+        self._log = None
+        if self.log_enabled:
+            self._log_append(f"📊 Calculating GPA for Student ID: {student_id}")
+
+        all_courses = self._collect_courses(
+            student_id, course_grades, include_transfer, transfer_grades
+        )
+
+        # Flatten (grade, weight) pairs into plain rows once; reducers only read rows
+        all_rows = self._preprocess_courses(all_courses)
+
+        # New enrollees with nothing graded yet: skip the reducers entirely
+        if not all_rows:
+            if self.log_enabled:
+                self._log_append("✅ No graded courses - all GPAs are 0.000")
+            return GPACalculation(
+                student_id=student_id,
+                weighted_gpa=0.0,
+                weighted_semester_gpas={},
+                unweighted_gpa=0.0,
+                unweighted_semester_gpas={},
+                core_weighted_gpa=0.0,
+                core_unweighted_gpa=0.0,
+                core_semester_gpas={},
+                total_credits_earned=0.0,
+                total_credits_attempted=0.0,
+                total_courses=0,
+                core_courses=0,
+                ap_courses=0,
+                honors_courses=0,
+                calculation_date=datetime.now(),
+            )
+
+        # One pass for the CORE subset and course type counts
+        core_rows = []
+        core_flags = []
+        ap_courses = honors_courses = 0
+        for row in all_rows:
+            core_flags.append(row.core)
+            if row.core:
+                core_rows.append(row)
+            if row.is_ap:
+                ap_courses += 1
+            if row.is_honors:
+                honors_courses += 1
+        core_mask = np.array(core_flags, dtype=bool)
+
+        # Score every row once; weighted and unweighted reducers share the arrays
+        all_arrays = self._gpa_arrays(all_rows)
+        core_arrays = tuple(values[core_mask] for values in all_arrays)
+
+        # Bucket by semester once; weighted and unweighted reducers share it
+        all_index = self._semester_index(all_rows)
+        core_index = self._semester_index(core_rows) if core_rows else None
+
+        # Calculate different GPA types
+        weighted_gpa, weighted_semester_gpas = self._calculate_weighted_gpa(
+            all_rows, all_index, all_arrays
+        )
+        unweighted_gpa, unweighted_semester_gpas = self._calculate_unweighted_gpa(
+            all_rows, all_index, all_arrays
+        )
+        core_weighted_gpa, core_semester_gpas = self._calculate_weighted_gpa(
+            core_rows, core_index, core_arrays
+        )
+        core_unweighted_gpa, _ = self._calculate_unweighted_gpa(
+            core_rows, core_index, core_arrays
+        )
+
+        # Calculate credit totals
+        total_credits_earned = self._calculate_credits_earned(all_rows)
+        total_credits_attempted = self._calculate_credits_attempted(all_rows)
+
+        # Create GPA calculation result
+        result = GPACalculation(
+            student_id=student_id,
+            weighted_gpa=weighted_gpa,
+            weighted_semester_gpas=weighted_semester_gpas,
+            unweighted_gpa=unweighted_gpa,
+            unweighted_semester_gpas=unweighted_semester_gpas,
+            core_weighted_gpa=core_weighted_gpa,
+            core_unweighted_gpa=core_unweighted_gpa,
+            core_semester_gpas=core_semester_gpas,
+            total_credits_earned=total_credits_earned,
+            total_credits_attempted=total_credits_attempted,
+            total_courses=len(all_rows),
+            core_courses=len(core_rows),
+            ap_courses=ap_courses,
+            honors_courses=honors_courses,
+            calculation_date=datetime.now(),
+        )
+
+        if self.log_enabled:
+            self._log_append(f"✅ Calculation complete:")
+            self._log_append(f"   Weighted GPA: {weighted_gpa:.3f}")
+            self._log_append(f"   Unweighted GPA: {unweighted_gpa:.3f}")
+            self._log_append(f"   CORE Weighted GPA: {core_weighted_gpa:.3f}")
+            self._log_append(f"   Total Credits: {total_credits_earned:.1f}")
+
+        return result
+
+    def calculate_gpas_batch(
+        self,
+        student_grades: Dict[int, List[CourseGrade]],
+        include_transfer: bool = True,
+        transfer_grades: Optional[Dict[int, List[TransferGrade]]] = None,
+    ) -> Dict[int, Tuple[float, float, float, float]]:
+        """
+        Calculate cumulative GPAs for a whole roster in one parallel pass
+
+        Use this instead of calculate_student_gpa() for bulk jobs that only need
+        the cumulative numbers (no semester breakdown, credits or course counts).
+
+        Args:
+            student_grades: Dictionary mapping student ID to their course grades
+            include_transfer: Whether to include transfer credits in calculations
+            transfer_grades: Dictionary mapping student ID to transfer grades
+
+        Returns:
+            Dictionary mapping student ID to
+            (weighted, unweighted, core_weighted, core_unweighted) GPA
+        """
+        self._log = None
+        transfer_grades = transfer_grades or {}
+
+        student_ids = list(student_grades)
+        student_offsets = np.zeros(len(student_ids) + 1, dtype=np.int64)
+        point_chunks, weight_chunks, credit_chunks, core_chunks = [], [], [], []
+
+        for i, student_id in enumerate(student_ids):
+            rows = self._preprocess_courses(
+                self._collect_courses(
+                    student_id,
+                    student_grades[student_id],
+                    include_transfer,
+                    transfer_grades.get(student_id),
+                )
+            )
+            base_points, weights, credits = self._gpa_arrays(rows)
+            point_chunks.append(base_points)
+            weight_chunks.append(weights)
+            credit_chunks.append(credits)
+            core_chunks.append(
+                np.fromiter((row.core for row in rows), dtype=bool, count=len(rows))
+            )
+            student_offsets[i + 1] = student_offsets[i] + len(rows)
+
+        if not student_ids:
+            return {}
+
+        gpas = _gpa_batch_kernel(
+            student_offsets,
+            np.concatenate(point_chunks),
+            np.concatenate(weight_chunks),
+            np.concatenate(credit_chunks),
+            np.concatenate(core_chunks),
+        )
+
+        return {
+            student_id: tuple(float(values[i]) for values in gpas)
+            for i, student_id in enumerate(student_ids)
+        }
+
+    def _collect_courses(
+        self,
+        student_id: int,
+        course_grades: List[CourseGrade],
+        include_transfer: bool,
+        transfer_grades: Optional[List[TransferGrade]],
+    ) -> List[Tuple[CourseGrade, CourseWeight]]:
+        """
+        Pair each GPA-eligible grade (school and transfer) with its course weight
 
-        # Separate courses by CORE flag
-        core_courses = []
+        Args:
+            student_id: Student identifier
+            course_grades: List of course grades from school
+            include_transfer: Whether to include transfer credits in calculations
+            transfer_grades: Transfer grade records if applicable
+
+        Returns:
+            List of (grade, weight_info) tuples
+        """
         all_courses = []
 
         # Process regular course grades
@@ -98,53 +501,37 @@ class GPACalculator:
             # Get course weight info
             weight_info = self._get_course_weight(grade.course_code)
             if weight_info is None:
-                self.calculation_log.append(
-                    f"⚠️ Warning: No weight info for {grade.course_code} - {grade.course_title}"
-                )
+                if self.log_enabled:
+                    self._log_append(
+                        f"⚠️ Warning: No weight info for {grade.course_code} - {grade.course_title}"
+                    )
                 continue
 
             # Skip zero-credit courses (middle school)
             if weight_info.credit == 0.0:
                 continue
 
-            # Add to appropriate lists
-            
-            # CHECK HONORS DETECTION OVERRIDE
-            if getattr(grade, "is_honors_detected", False):
-                # If detected as honors title, ensuring weight reflects it
-                if not weight_info.is_honors and not weight_info.is_ap:
-                    # Create a synthetic Honors weight (base + 0.5)
-                    # Use dataclass/pydantic copy or create new
-                    # CourseWeight is a Pydantic model
-                    new_weight = weight_info.weight
-                    if new_weight == 0.0 or new_weight == 4.0: # Standard scale usually max 4.0? or weight=0.0 means unweighted?
-                         # Usually standard weight is 0.0 in "added weight" terms? No, wait.
-                         # CourseWeight definition: weight: float ... 0.5=honors, 1.0=AP.
-                         # If it's 0.0, we make it 0.5.
-                         new_weight = 0.5
-                    
-                    weight_info = weight_info.copy(update={"weight": new_weight})
-                    # Also log it?
-                    # logger.info(f"✨ Upgraded {grade.course_title} to Honors weight")
-
             all_courses.append((grade, weight_info))
-            if weight_info.core:
-                core_courses.append((grade, weight_info))
 
         # CRITICAL FIX: Process transfer grades if included
         if include_transfer and transfer_grades:
-            self.calculation_log.append(
-                f"📚 Processing {len(transfer_grades)} transfer grades"
-            )
+            if self.log_enabled:
+                self._log_append(
+                    f"📚 Processing {len(transfer_grades)} transfer grades"
+                )
+            transfer_added = 0
             for transfer in transfer_grades:
                 # Get course weight info for transfer course
                 weight_info = self._get_course_weight(transfer.course_code)
                 if weight_info is None:
-                    self.calculation_log.append(
-                        f"⚠️ Warning: No weight info for transfer course {transfer.course_code} - {transfer.course_title}"
-                    )
+                    if self.log_enabled:
+                        self._log_append(
+                            f"⚠️ Warning: No weight info for transfer course {transfer.course_code} - {transfer.course_title}"
+                        )
                     continue
 
+                transfer_added += 1
+
                 # Skip zero-credit courses
                 if weight_info.credit == 0.0:
                     continue
@@ -169,295 +556,279 @@ class GPACalculator:
                     credits_earned=transfer.credits_attempted,
                 )
 
-                # Add to appropriate lists
                 all_courses.append((transfer_as_grade, weight_info))
-                if weight_info.core:
-                    core_courses.append((transfer_as_grade, weight_info))
-
-            transfer_added = len(
-                [t for t in transfer_grades if self._get_course_weight(t.course_code)]
-            )
-            self.calculation_log.append(
-                f"✅ Added {transfer_added} transfer grades to GPA"
-            )
-
-        # Calculate different GPA types
-        weighted_gpa, weighted_semester_gpas = self._calculate_weighted_gpa(all_courses)
-        unweighted_gpa, unweighted_semester_gpas = self._calculate_unweighted_gpa(
-            all_courses
-        )
-        core_weighted_gpa, core_semester_gpas = self._calculate_weighted_gpa(
-            core_courses
-        )
-        core_unweighted_gpa, _ = self._calculate_unweighted_gpa(core_courses)
-
-        # Calculate credit totals
-        total_credits_earned = self._calculate_credits_earned(all_courses)
-        total_credits_attempted = self._calculate_credits_attempted(all_courses)
-
-        # Count course types
-        ap_courses = sum(1 for _, weight in all_courses if weight.is_ap)
-        honors_courses = sum(1 for _, weight in all_courses if weight.is_honors)
-
-        # Create GPA calculation result
-        result = GPACalculation(
-            student_id=student_id,
-            weighted_gpa=weighted_gpa,
-            weighted_semester_gpas=weighted_semester_gpas,
-            unweighted_gpa=unweighted_gpa,
-            unweighted_semester_gpas=unweighted_semester_gpas,
-            core_weighted_gpa=core_weighted_gpa,
-            core_unweighted_gpa=core_unweighted_gpa,
-            core_semester_gpas=core_semester_gpas,
-            total_credits_earned=total_credits_earned,
-            total_credits_attempted=total_credits_attempted,
-            total_courses=len(all_courses),
-            core_courses=len(core_courses),
-            ap_courses=ap_courses,
-            honors_courses=honors_courses,
-            calculation_date=datetime.now(),
-        )
 
-        self.calculation_log.append(f"✅ Calculation complete:")
-        self.calculation_log.append(f"   Weighted GPA: {weighted_gpa:.3f}")
-        self.calculation_log.append(f"   Unweighted GPA: {unweighted_gpa:.3f}")
-        self.calculation_log.append(f"   CORE Weighted GPA: {core_weighted_gpa:.3f}")
-        self.calculation_log.append(f"   Total Credits: {total_credits_earned:.1f}")
+            if self.log_enabled:
+                self._log_append(f"✅ Added {transfer_added} transfer grades to GPA")
 
-        return result
+        return all_courses
 
     def _get_course_weight(self, course_code: str) -> Optional[CourseWeight]:
         """Get course weight information from index"""
         return self.course_weights_index.get(course_code)
 
-    def _calculate_weighted_gpa(
+    def _preprocess_courses(
         self, courses: List[Tuple[CourseGrade, CourseWeight]]
-    ) -> Tuple[float, Dict[str, float]]:
+    ) -> List[_CourseRow]:
         """
-        Calculate weighted GPA (base points + course weight)
+        Read every field the reducers need off the models exactly once
 
         Args:
             courses: List of (grade, weight_info) tuples
 
         Returns:
-            Tuple of (cumulative_gpa, semester_gpas_dict)
+            List of _CourseRow records in the same order
         """
-        if not courses:
-            return 0.0, {}
-
-        # Organize by semester
-        semester_courses = {}
+        rows = []
         for grade, weight in courses:
-            semester_key = f"{grade.school_year}-S{grade.semester}"
-            if semester_key not in semester_courses:
-                semester_courses[semester_key] = []
-            semester_courses[semester_key].append((grade, weight))
-
-        # Calculate semester GPAs
-        semester_gpas = {}
-        total_weighted_points = 0.0
-        total_credits = 0.0
-
-        for semester, semester_course_list in semester_courses.items():
-            semester_points = 0.0
-            semester_credits = 0.0
-
-            for grade, weight in semester_course_list:
-                # Skip blank/empty grades (no credit attempted)
-                grade_str = str(grade.grade).strip()
-                if grade_str.upper() in ["W", "WITHDRAWN", "—", "", "NONE", "NAN"]:
-                    continue  # No credit attempted for blank grades
+            (
+                course_code,
+                raw_grade,
+                school_year,
+                semester,
+                credits_attempted,
+                is_honors_detected,
+            ) = _GRADE_FIELDS(grade)
+            credit, weight_add, core, is_ap, is_honors = _WEIGHT_FIELDS(weight)
+
+            # Parse explicit credits once so the reducers never try/except
+            try:
+                explicit_credit = (
+                    float(credits_attempted) if credits_attempted else math.nan
+                )
+            except (ValueError, TypeError):
+                explicit_credit = math.nan
+            if explicit_credit > 0:
+                semester_credit = explicit_credit
+            else:
+                semester_credit = self._semester_credit.get(course_code)
+                if semester_credit is None:
+                    semester_credit = credit * 0.5
+
+            # HONORS DETECTION OVERRIDE: a title detected as honors on a standard
+            # course gets the honors weight (0.5) without copying the weight model
+            if (
+                is_honors_detected
+                and not is_honors
+                and not is_ap
+                and weight_add in (0.0, 4.0)
+            ):
+                weight_add = 0.5
+                is_honors = True
+
+            # Normalize + encode the grade in one cached probe
+            grade_upper, grade_code, recognized = _classify_grade(raw_grade)
+            if not recognized and self.log_enabled:
+                self._log_append(f"⚠️ Unknown grade format: {raw_grade}")
+
+            rows.append(
+                _CourseRow(
+                    grade=raw_grade,
+                    grade_upper=grade_upper,
+                    semester_key=f"{school_year}-S{semester}",
+                    grade_code=grade_code,
+                    semester_credit=semester_credit,
+                    weight=weight_add,
+                    core=core,
+                    is_ap=is_ap,
+                    is_honors=is_honors,
+                )
+            )
+        return rows
 
-                # Get base grade points
-                grade_points = self._grade_to_points(grade.grade)
-                if grade_points is None:
-                    continue  # Skip non-GPA grades (P/F, I, W)
+    def _semester_index(self, rows: List[_CourseRow]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Bucket courses by semester once so the GPA reducers can share it
 
-                # Add course weight
-                weighted_points = grade_points + weight.weight
+        Args:
+            rows: Preprocessed course rows
 
-                # Determine credits for this semester
-                # Each row represents ONE semester of a course
-                # Default: weight.credit / 2 (semester is half of year)
-                semester_credit = weight.credit / 2
+        Returns:
+            Tuple of (unique_semester_keys, per_course_bucket_index)
+        """
+        semester_keys = np.array([row.semester_key for row in rows])
+        return np.unique(semester_keys, return_inverse=True)
 
-                # Override with explicit credits if available
-                if grade.credits_attempted:
-                    try:
-                        explicit_credit = float(grade.credits_attempted)
-                        if explicit_credit > 0:
-                            semester_credit = explicit_credit
-                    except (ValueError, TypeError):
-                        pass  # Use default calculation
+    def _reduce_semesters(
+        self,
+        semester_index: Tuple[np.ndarray, np.ndarray],
+        points: np.ndarray,
+        credits: np.ndarray,
+    ) -> Tuple[float, Dict[str, float]]:
+        """
+        Sum per-course points/credits into semester and cumulative GPAs
 
-                course_contribution = weighted_points * semester_credit
+        Args:
+            semester_index: Output of _semester_index() for the same courses
+            points: Grade points * credits for each course (0.0 if skipped)
+            credits: Credits counted for each course (0.0 if skipped)
 
-                semester_points += course_contribution
-                semester_credits += semester_credit
+        Returns:
+            Tuple of (cumulative_gpa, semester_gpas_dict)
+        """
+        semesters, inverse = semester_index
+        semester_points = np.bincount(inverse, weights=points, minlength=len(semesters))
+        semester_credits = np.bincount(
+            inverse, weights=credits, minlength=len(semesters)
+        )
 
-            # Calculate semester GPA
-            if semester_credits > 0:
-                semester_gpa = semester_points / semester_credits
-                semester_gpas[semester] = round(semester_gpa, 3)
+        # Calculate semester GPAs
+        has_credits = semester_credits > 0
+        semester_gpas = {
+            str(semester): round(float(sem_points / sem_credits), 3)
+            for semester, sem_points, sem_credits in zip(
+                semesters[has_credits],
+                semester_points[has_credits],
+                semester_credits[has_credits],
+            )
+        }
 
-                total_weighted_points += semester_points
-                total_credits += semester_credits
+        total_points = float(semester_points[has_credits].sum())
+        total_credits = float(semester_credits[has_credits].sum())
 
         # Calculate cumulative GPA - DON'T round here, let display handle it
         cumulative_gpa = 0.0
         if total_credits > 0:
-            cumulative_gpa = total_weighted_points / total_credits
+            cumulative_gpa = total_points / total_credits
 
         # Return raw cumulative (will be formatted at display time)
         # But still round semester GPAs for consistency
         return cumulative_gpa, semester_gpas
 
-    def _calculate_unweighted_gpa(
-        self, courses: List[Tuple[CourseGrade, CourseWeight]]
+    def _gpa_arrays(
+        self, rows: List[_CourseRow]
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Score each row once for the GPA reducers
+
+        Args:
+            rows: Preprocessed course rows
+
+        Returns:
+            Tuple of (base_points, weights, semester_credits) arrays. base_points
+            is NaN for rows that don't count in GPA (blank, P/F, I, W).
+        """
+        n = len(rows)
+        codes = np.fromiter((row.grade_code for row in rows), dtype=np.int8, count=n)
+
+        # Skip blank/empty and non-GPA grades (P/F, I, W)
+        counted = codes != NO_GRADE_CODE
+        base_points = np.where(counted, GRADE_POINTS_LUT[codes], np.nan)
+        weights = np.fromiter((row.weight for row in rows), dtype=float, count=n)
+        credits = np.fromiter(
+            (row.semester_credit for row in rows), dtype=float, count=n
+        )
+
+        weights[~counted] = 0.0
+        credits[~counted] = 0.0
+
+        return base_points, weights, credits
+
+    def _calculate_weighted_gpa(
+        self,
+        rows: List[_CourseRow],
+        semester_index: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+        gpa_arrays: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None,
     ) -> Tuple[float, Dict[str, float]]:
         """
-        Calculate unweighted GPA (standard 4.0 scale, no course weights)
+        Calculate weighted GPA (base points + course weight)
 
         Args:
-            courses: List of (grade, weight_info) tuples
+            rows: Preprocessed course rows
+            semester_index: Precomputed _semester_index(rows), if available
+            gpa_arrays: Precomputed _gpa_arrays(rows), if available
 
         Returns:
             Tuple of (cumulative_gpa, semester_gpas_dict)
         """
-        if not courses:
+        if not rows:
             return 0.0, {}
 
-        # Organize by semester
-        semester_courses = {}
-        for grade, weight in courses:
-            semester_key = f"{grade.school_year}-S{grade.semester}"
-            if semester_key not in semester_courses:
-                semester_courses[semester_key] = []
-            semester_courses[semester_key].append((grade, weight))
-
-        # Calculate semester GPAs
-        semester_gpas = {}
-        total_points = 0.0
-        total_credits = 0.0
-
-        for semester, semester_course_list in semester_courses.items():
-            semester_points = 0.0
-            semester_credits = 0.0
+        if semester_index is None:
+            semester_index = self._semester_index(rows)
+        if gpa_arrays is None:
+            gpa_arrays = self._gpa_arrays(rows)
 
-            for grade, weight in semester_course_list:
-                # Skip blank/empty grades (no credit attempted)
-                grade_str = str(grade.grade).strip()
-                if grade_str.upper() in ["W", "WITHDRAWN", "—", "", "NONE", "NAN"]:
-                    continue  # No credit attempted for blank grades
+        base_points, weights, credits = gpa_arrays
+        counted = ~np.isnan(base_points)
 
-                # Get base grade points (no weight added)
-                grade_points = self._grade_to_points(grade.grade)
-                if grade_points is None:
-                    continue  # Skip non-GPA grades
+        # Add course weight to base grade points
+        points = np.where(counted, (base_points + weights) * credits, 0.0)
+        credits = np.where(counted, credits, 0.0)
 
-                # Determine credits for this semester
-                # Each row represents ONE semester
-                # Default: weight.credit / 2 (semester is half-year)
-                semester_credit = weight.credit / 2
+        return self._reduce_semesters(semester_index, points, credits)
 
-                # Override with explicit credits if available
-                if grade.credits_attempted:
-                    try:
-                        explicit_credit = float(grade.credits_attempted)
-                        if explicit_credit > 0:
-                            semester_credit = explicit_credit
-                    except (ValueError, TypeError):
-                        pass  # Use default calculation
+    def _calculate_unweighted_gpa(
+        self,
+        rows: List[_CourseRow],
+        semester_index: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+        gpa_arrays: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None,
+    ) -> Tuple[float, Dict[str, float]]:
+        """
+        Calculate unweighted GPA (standard 4.0 scale, no course weights)
 
-                course_contribution = grade_points * semester_credit
+        Args:
+            rows: Preprocessed course rows
+            semester_index: Precomputed _semester_index(rows), if available
+            gpa_arrays: Precomputed _gpa_arrays(rows), if available
 
-                semester_points += course_contribution
-                semester_credits += semester_credit
+        Returns:
+            Tuple of (cumulative_gpa, semester_gpas_dict)
+        """
+        if not rows:
+            return 0.0, {}
 
-            # Calculate semester GPA
-            if semester_credits > 0:
-                semester_gpa = semester_points / semester_credits
-                semester_gpas[semester] = round(semester_gpa, 3)
+        if semester_index is None:
+            semester_index = self._semester_index(rows)
+        if gpa_arrays is None:
+            gpa_arrays = self._gpa_arrays(rows)
 
-                total_points += semester_points
-                total_credits += semester_credits
+        base_points, _, credits = gpa_arrays
+        counted = ~np.isnan(base_points)
 
-        # Calculate cumulative GPA - DON'T round here, let display handle it
-        cumulative_gpa = 0.0
-        if total_credits > 0:
-            cumulative_gpa = total_points / total_credits
+        # Base grade points only (no weight added)
+        points = np.where(counted, base_points * credits, 0.0)
+        credits = np.where(counted, credits, 0.0)
 
-        # Return raw cumulative (will be formatted at display time)
-        return cumulative_gpa, semester_gpas
+        return self._reduce_semesters(semester_index, points, credits)
 
-    def _calculate_credits_earned(
-        self, courses: List[Tuple[CourseGrade, CourseWeight]]
-    ) -> float:
+    def _calculate_credits_earned(self, rows: List[_CourseRow]) -> float:
         """
         Calculate total credits earned (passing grades only)
 
         Note: Each course entry represents ONE SEMESTER.
-        We calculate semester credits (weight.credit / 2) for each entry.
+        We calculate semester credits (credit / 2) for each entry.
         BLANK grades (—, empty, None) = NO CREDIT EARNED
         """
         total = 0.0
 
-        for grade, weight in courses:
-            # Check if grade is passing and not blank
-            grade_str = str(grade.grade).strip()
-            if grade_str.upper() not in [
-                "W",
-                "WITHDRAWN",
-                "—",
-                "",
-                "NONE",
-                "NAN",
-            ] and self._is_passing_grade(grade.grade):
-                # Each row is one semester, so use half the year credit
-                semester_credit = weight.credit / 2
-
-                # Override if grade has explicit credits
-                if grade.credits_attempted:
-                    try:
-                        explicit_credit = float(grade.credits_attempted)
-                        if explicit_credit > 0:
-                            semester_credit = explicit_credit
-                    except (ValueError, TypeError):
-                        pass
-
-                total += semester_credit
-        
+        for row in rows:
+            # Letter-coded grades pass iff they earn points; others need the rules
+            if row.grade_code != NO_GRADE_CODE:
+                passing = GRADE_PASSING_LUT[row.grade_code]
+            else:
+                passing = row.grade_upper not in BLANK_GRADES and (
+                    self._is_passing_grade(row.grade_upper)
+                )
+            if passing:
+                total += row.semester_credit
+
         return round(total, 2)
 
-    def _calculate_credits_attempted(
-        self, courses: List[Tuple[CourseGrade, CourseWeight]]
-    ) -> float:
+    def _calculate_credits_attempted(self, rows: List[_CourseRow]) -> float:
         """
         Calculate total credits attempted (all courses)
 
         Note: Each course entry represents ONE SEMESTER.
-        We calculate semester credits (weight.credit / 2) for each entry.
+        We calculate semester credits (credit / 2) for each entry.
         BLANK grades (—, empty, None) = NO CREDIT ATTEMPTED
         """
         total = 0.0
 
-        for grade, weight in courses:
+        for row in rows:
             # Don't count withdrawn, blank, or missing grades
-            grade_str = str(grade.grade).strip()
-            if grade_str.upper() not in ["W", "WITHDRAWN", "—", "", "NONE", "NAN"]:
-                # Each row is one semester, so use half the year credit
-                semester_credit = weight.credit / 2
-
-                # Override if grade has explicit credits
-                if grade.credits_attempted:
-                    try:
-                        explicit_credit = float(grade.credits_attempted)
-                        if explicit_credit > 0:
-                            semester_credit = explicit_credit
-                    except (ValueError, TypeError):
-                        pass
-
-                total += semester_credit
+            if row.grade_upper not in BLANK_GRADES:
+                total += row.semester_credit
 
         return round(total, 2)
 
@@ -471,83 +842,19 @@ class GPACalculator:
         Returns:
             Grade points (0.0-4.0) or None if non-GPA grade
         """
-        # Handle case where grade might be numeric type
-        if isinstance(grade, (int, float)):
-            try:
-                numeric = float(grade)
-                letter_grade = self._numeric_to_letter(numeric)
-                return GRADE_POINTS.get(letter_grade, None)
-            except (ValueError, TypeError):
-                return None
-
-        # Convert to string if not already
-        grade_str = str(grade) if not isinstance(grade, str) else grade
-        grade_upper = grade_str.strip().upper()
-
-        # Check if non-GPA grade
-        if grade_upper in NON_GPA_GRADES:
-            return None
-
-        # Try direct lookup
-        if grade_upper in GRADE_POINTS:
-            return GRADE_POINTS[grade_upper]
-
-        # Handle numeric grades (convert to letter)
-        try:
-            numeric = float(grade_str)
-            letter_grade = self._numeric_to_letter(numeric)
-            return GRADE_POINTS.get(letter_grade, None)
-        except ValueError:
+        grade_points, recognized = _lookup_grade_points(grade)
+        if not recognized and self.log_enabled:
             # Unknown grade format
-            self.calculation_log.append(f"⚠️ Unknown grade format: {grade}")
-            return None
+            self._log_append(f"⚠️ Unknown grade format: {grade}")
+        return grade_points
 
     def _numeric_to_letter(self, numeric_grade: float) -> str:
         """Convert numeric grade (0-100) to letter grade"""
-        if numeric_grade >= 93:
-            return "A"
-        elif numeric_grade >= 90:
-            return "A-"
-        elif numeric_grade >= 87:
-            return "B+"
-        elif numeric_grade >= 83:
-            return "B"
-        elif numeric_grade >= 80:
-            return "B-"
-        elif numeric_grade >= 77:
-            return "C+"
-        elif numeric_grade >= 73:
-            return "C"
-        elif numeric_grade >= 70:
-            return "C-"
-        elif numeric_grade >= 67:
-            return "D+"
-        elif numeric_grade >= 63:
-            return "D"
-        elif numeric_grade >= 60:
-            return "D-"
-        else:
-            return "F"
+        return _numeric_to_letter(numeric_grade)
 
     def _is_passing_grade(self, grade: str) -> bool:
         """Check if grade is passing"""
-        grade_upper = grade.strip().upper()
-
-        # Explicit fail grades
-        if grade_upper in ["F", "NP", "FAIL", "W", "WITHDRAWN"]:
-            return False
-
-        # Pass grade
-        if grade_upper in ["P", "PASS"]:
-            return True
-
-        # Letter grades - F is failing
-        grade_points = self._grade_to_points(grade)
-        if grade_points is not None:
-            return grade_points > 0.0
-
-        # Unknown - assume passing (conservative)
-        return True
+        return _is_passing_grade(grade)
 
     def calculate_class_rank(
         self, student_gpa: float, all_student_gpas: List[Tuple[int, float]]
@@ -555,6 +862,10 @@ class GPACalculator:
         """
         Calculate class rank based on weighted GPA
 
+        Ranks are competition-style: equal GPAs share the best rank and the
+        next distinct GPA skips ahead. When ranking a whole class, use
+        precompute_class_ranks() once instead of calling this per student.
+
         Args:
             student_gpa: This student's weighted GPA
             all_student_gpas: List of (student_id, gpa) tuples for entire class
@@ -562,36 +873,80 @@ class GPACalculator:
         Returns:
             Tuple of (rank, total_students, decile_description)
         """
-        # Sort by GPA descending
-        sorted_gpas = sorted(all_student_gpas, key=lambda x: x[1], reverse=True)
-
-        # Find student's rank
-        rank = 1
-        for i, (sid, gpa) in enumerate(sorted_gpas):
-            if gpa == student_gpa:
-                # Handle ties - same GPA gets same rank
-                if i > 0 and sorted_gpas[i - 1][1] == gpa:
-                    rank = rank  # Keep previous rank
-                else:
-                    rank = i + 1
-                break
-
-        total_students = len(sorted_gpas)
-
-        # Calculate decile
+        gpas = np.fromiter(
+            (gpa for _, gpa in all_student_gpas),
+            dtype=np.float64,
+            count=len(all_student_gpas),
+        )
+
+        # Rank = 1 + number of students with a strictly higher GPA (no sort needed)
+        rank = int(np.count_nonzero(gpas > student_gpa)) + 1
+        total_students = len(gpas)
+
+        return rank, total_students, self._rank_to_decile(rank, total_students)
+
+    def precompute_class_ranks(
+        self, all_student_gpas: List[Tuple[int, float]]
+    ) -> Dict[int, Tuple[int, int, str]]:
+        """
+        Calculate class rank for every student with a single sort
+
+        Args:
+            all_student_gpas: List of (student_id, gpa) tuples for entire class
+
+        Returns:
+            Dictionary mapping student_id to (rank, total_students, decile_description)
+        """
+        if not all_student_gpas:
+            return {}
+
+        student_ids = [sid for sid, _ in all_student_gpas]
+        gpas = np.fromiter(
+            (gpa for _, gpa in all_student_gpas),
+            dtype=np.float64,
+            count=len(all_student_gpas),
+        )
+        total_students = len(gpas)
+
+        # Sort once (descending); equal GPAs share the lowest position via searchsorted
+        order = np.argsort(-gpas, kind="stable")
+        sorted_desc = gpas[order]
+        ranks = np.searchsorted(-sorted_desc, -gpas, side="left") + 1
+
+        class_ranks = {}
+        for sid, rank in zip(student_ids, ranks.tolist()):
+            class_ranks[sid] = (
+                rank,
+                total_students,
+                self._rank_to_decile(rank, total_students),
+            )
+
+        return class_ranks
+
+    def _rank_to_decile(self, rank: int, total_students: int) -> str:
+        """Convert a rank into its decile description"""
         percentile = (rank / total_students) * 100
         if percentile <= 10:
-            decile = "Top 10%"
+            return "Top 10%"
         elif percentile <= 20:
-            decile = "Top 20%"
+            return "Top 20%"
         elif percentile <= 25:
-            decile = "Top 25%"
+            return "Top 25%"
         elif percentile <= 50:
-            decile = "Top 50%"
+            return "Top 50%"
         else:
-            decile = f"Rank {rank} of {total_students}"
+            return f"Rank {rank} of {total_students}"
+
+    def _log_append(self, message: str):
+        """Record a calculation_log entry, allocating the log on first use"""
+        if self._log is None:
+            self._log = []
+        self._log.append(message)
 
-        return rank, total_students, decile
+    @property
+    def calculation_log(self) -> List[str]:
+        """Entries recorded by the last calculation (empty if logging is off)"""
+        return self._log or []
 
     def get_calculation_log(self) -> List[str]:
         """Get detailed calculation log for debugging"""
@@ -705,7 +1060,7 @@ def main():
     ]
 
     # Initialize calculator
-    calculator = GPACalculator(course_weights)
+    calculator = GPACalculator(course_weights, log_enabled=True)
 
     # Calculate GPA
     result = calculator.calculate_student_gpa(1001, sample_grades)
@@ -750,6 +1105,9 @@ def main():
     print(f"  Rank: {rank} of {total}")
     print(f"  Decile: {decile}")
 
+    class_ranks = calculator.precompute_class_ranks(sample_class_gpas)
+    print(f"  Precomputed ranks: {class_ranks}")
+
     print("\n✅ GPA calculator test complete!")
 
 
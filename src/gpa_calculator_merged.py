@@ -10,8 +10,180 @@ Rules:
 - Blank grades already excluded from merged dataset
 """
 
+import hashlib
+import logging
+import os
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
 import pandas as pd
-from typing import Dict, Tuple
+from typing import Dict, Optional, Tuple
+
+# JIT compilation for the GPA reductions (optional - plain Python fallback)
+from numba_compat import njit, prange
+
+# Lazy, parallel CSV -> groupby pipeline for roster reports (optional)
+try:
+    import polars as pl
+
+    POLARS_AVAILABLE = True
+except ImportError:
+    POLARS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Columns the calculator (and data_processor via .df) reads; the export carries
+# many more, which are skipped at parse time
+MERGED_GRADE_COLUMNS = (
+    "User ID",
+    "First Name",
+    "Last Name",
+    "Academic Year",
+    "Course Code",
+    "Course Title",
+    "Grade Earned",
+    "Credit Earned",
+    "Weight",
+    "CORE",
+)
+# Low-cardinality text columns are stored as categoricals. Academic Year stays
+# plain text (a categorical key would make the groupbys emit every combination);
+# Credit Earned/Weight are parsed with to_numeric later, as they can hold junk.
+MERGED_GRADE_DTYPES = {
+    "Grade Earned": "category",
+    "CORE": "category",
+    "Academic Year": str,
+}
+
+
+def _compact_floats(values: np.ndarray) -> np.ndarray:
+    """Store values as float32 when every one survives the round trip exactly"""
+    compact = values.astype(np.float32)
+    return compact if np.array_equal(compact, values) else values
+
+
+def _merged_grades_fingerprint(csv_file: Path) -> str:
+    """
+    Digest of a grades CSV's contents plus the columns/dtypes parsed from it
+
+    Returns:
+        16-character hex digest used in the Parquet cache file name
+    """
+    digest = hashlib.blake2b(digest_size=8)
+    digest.update(
+        repr(
+            (MERGED_GRADE_COLUMNS, sorted(map(str, MERGED_GRADE_DTYPES.items())))
+        ).encode()
+    )
+    with open(csv_file, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _write_parquet_atomic(df: pd.DataFrame, parquet_file: Path) -> None:
+    """
+    Write df to parquet_file via a temporary file and an atomic rename
+
+    Concurrent writers (e.g. batch worker processes) never leave a partial
+    file behind; the last complete copy wins. Failures only log a warning.
+    """
+    try:
+        parquet_file.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(
+            dir=parquet_file.parent, prefix=parquet_file.stem, suffix=".tmp"
+        )
+        os.close(fd)
+        try:
+            df.to_parquet(tmp_name, compression="zstd")
+            os.replace(tmp_name, parquet_file)
+        finally:
+            if os.path.exists(tmp_name):
+                os.remove(tmp_name)
+    except ImportError:
+        pass  # No Parquet engine installed - keep parsing the CSV
+    except Exception as e:
+        logger.warning(f"⚠️  Could not write Parquet cache {parquet_file}: {e}")
+
+
+@njit(cache=True)
+def _student_totals(
+    grade_codes: np.ndarray,
+    points_lut: np.ndarray,
+    credits: np.ndarray,
+    weights: np.ndarray,
+    is_core: np.ndarray,
+    passing: np.ndarray,
+    weighted: bool,
+    core_only: bool,
+) -> Tuple[float, float, float, float]:
+    """
+    Fused GPA/credit sums over one student's rows, accumulated in row order
+
+    Grade points are gathered from the float64 points_lut by grade code, and
+    float32 credits/weights promote to float64, so sums are exact as float64.
+
+    Returns:
+        (gpa_points, gpa_credits, credits_attempted, credits_earned)
+    """
+    gpa_points = 0.0
+    gpa_credits = 0.0
+    credits_attempted = 0.0
+    credits_earned = 0.0
+    for i in range(grade_codes.shape[0]):
+        credit = credits[i]
+        credits_attempted += credit
+        if passing[i]:
+            credits_earned += credit
+        if is_core[i] or not core_only:
+            points = points_lut[grade_codes[i]]
+            if weighted:
+                points += weights[i]
+            gpa_points += points * credit
+            gpa_credits += credit
+    return gpa_points, gpa_credits, credits_attempted, credits_earned
+
+
+@njit(parallel=True, cache=True)
+def _roster_totals(
+    student_offsets: np.ndarray,
+    grade_codes: np.ndarray,
+    points_lut: np.ndarray,
+    credits: np.ndarray,
+    weights: np.ndarray,
+    is_core: np.ndarray,
+    passing: np.ndarray,
+    weighted: bool,
+    core_only: bool,
+) -> np.ndarray:
+    """
+    _student_totals for every student at once, one student per parallel task
+
+    Rows are grouped by student CSR-style: student i owns rows
+    student_offsets[i]:student_offsets[i + 1].
+
+    Returns:
+        (n_students, 4) array of
+        (gpa_points, gpa_credits, credits_attempted, credits_earned)
+    """
+    n_students = student_offsets.shape[0] - 1
+    totals = np.zeros((n_students, 4))
+    for i in prange(n_students):
+        start = student_offsets[i]
+        end = student_offsets[i + 1]
+        totals[i, :] = _student_totals(
+            grade_codes[start:end],
+            points_lut,
+            credits[start:end],
+            weights[start:end],
+            is_core[start:end],
+            passing[start:end],
+            weighted,
+            core_only,
+        )
+    return totals
 
 
 class MergedGPACalculator:
@@ -86,17 +258,143 @@ class MergedGPACalculator:
         "50": 0.0,
     }
 
-    def __init__(self, merged_grades_path: str):
-        """Initialize with path to Merged_Grades.csv"""
-        self.df = pd.read_csv(merged_grades_path)
+    # Raw spellings as exported (upper/lower case) -> points, so the common case
+    # is one dict probe with no string normalization
+    _GRADE_POINTS_BY_RAW = {
+        **GRADE_POINTS,
+        **{grade.lower(): points for grade, points in GRADE_POINTS.items()},
+    }
+
+    def __init__(
+        self,
+        merged_grades_path: str,
+        use_parquet_cache: bool = False,
+        cache_dir: Optional[str] = None,
+    ):
+        """
+        Initialize with path to Merged_Grades.csv
+
+        Args:
+            merged_grades_path: Path to Merged_Grades.csv
+            use_parquet_cache: Reuse/write a Parquet copy of the parsed columns
+                (needs pyarrow; skipped quietly without it)
+            cache_dir: Directory for the Parquet copy (default: .cache beside
+                the CSV)
+        """
+        self.merged_grades_path = merged_grades_path
+        self.df = self._load_merged_grades(
+            merged_grades_path, use_parquet_cache, cache_dir
+        )
+
+        # Parse grades/credits/weights once; every GPA query reads these arrays.
+        # Grades repeat heavily, so normalize each distinct value once and keep
+        # only a compact integer code per row (-1 = missing hits the trailing 0.0).
+        grade_codes, grade_values = pd.factorize(self.df["Grade Earned"])
+        self._points_lut = np.array(
+            [self._grade_to_points(grade) for grade in grade_values] + [0.0]
+        )
+        self._grade_codes = grade_codes.astype(
+            np.min_scalar_type(-len(self._points_lut))
+        )
+        self._credits = _compact_floats(
+            pd.to_numeric(self.df["Credit Earned"], errors="coerce")
+            .fillna(0.0)
+            .to_numpy(dtype=float)
+        )
+        # Weight is cleaned in place too: blank/unparseable -> 0.0 for every reader
+        self.df["Weight"] = pd.to_numeric(self.df["Weight"], errors="coerce").fillna(
+            0.0
+        )
+        self._weights = _compact_floats(self.df["Weight"].to_numpy(dtype=float))
+        self._is_core = self.df["CORE"].to_numpy() == "Yes"
+        self._passing = self._points_lut[self._grade_codes] > 0.0
+
+        # Row positions per student (and per student-year for term GPAs), so
+        # lookups never scan the whole dataset
+        self._rows_by_user: Dict[int, np.ndarray] = self.df.groupby(
+            "User ID", sort=False
+        ).indices
+        self._rows_by_user_year: Dict[Tuple[int, str], np.ndarray] = self.df.groupby(
+            ["User ID", "Academic Year"], sort=False
+        ).indices
+
+        # CSR layout for roster-wide runs: students in first-appearance order,
+        # each student's rows contiguous (and in file order) within _row_order
+        student_codes, self._student_ids = pd.factorize(self.df["User ID"])
+        self._row_order = np.argsort(student_codes, kind="stable")
+        self._student_offsets = np.concatenate(
+            ([0], np.cumsum(np.bincount(student_codes)))
+        )
+
+        # Per-weighting term GPA tables, built lazily by _term_gpa_table(), and
+        # memoized cumulative results. Both assume the loaded CSV doesn't change -
+        # create a new calculator to pick up a new Merged_Grades.csv.
+        self._term_gpa_tables: Dict[bool, dict] = {}
+        self._cumulative_cache: Dict[Tuple[int, bool, bool], Dict[str, float]] = {}
+
         print(f"📊 Loaded {len(self.df):,} grade records from merged dataset")
         print(f"   Students: {self.df['User ID'].nunique()}")
         print(f"   CORE courses: {len(self.df[self.df['CORE'] == 'Yes']):,}")
 
-    def _grade_to_points(self, grade: str) -> float:
-        """Convert letter or numeric grade to points"""
-        grade = str(grade).strip().upper()
-        return self.GRADE_POINTS.get(grade, 0.0)
+    @staticmethod
+    def _load_merged_grades(
+        csv_path: str, use_parquet_cache: bool, cache_dir: Optional[str] = None
+    ) -> pd.DataFrame:
+        """
+        Read only the needed columns of Merged_Grades.csv, with compact dtypes
+
+        With use_parquet_cache, the parsed frame is also kept as Parquet. The
+        cache file is named after a digest of the CSV contents and the column
+        schema, so an edited or replaced CSV (whatever its mtime) or a schema
+        change never reads back a stale copy.
+
+        Args:
+            csv_path: Path to Merged_Grades.csv
+            use_parquet_cache: Whether to read/write the Parquet copy
+            cache_dir: Directory for the Parquet copy (default: .cache beside
+                the CSV)
+
+        Returns:
+            Grade DataFrame restricted to MERGED_GRADE_COLUMNS
+
+        Raises:
+            ValueError: If the CSV lacks any of MERGED_GRADE_COLUMNS
+        """
+        csv_file = Path(csv_path)
+        if use_parquet_cache:
+            cache_root = Path(cache_dir) if cache_dir else csv_file.parent / ".cache"
+            parquet_file = cache_root / (
+                f"{csv_file.stem}-{_merged_grades_fingerprint(csv_file)}.parquet"
+            )
+            if parquet_file.exists():
+                try:
+                    df = pd.read_parquet(parquet_file)
+                    if set(df.columns) == set(MERGED_GRADE_COLUMNS):
+                        return df
+                    logger.warning(f"⚠️  Ignoring Parquet cache {parquet_file}")
+                except Exception as e:
+                    logger.warning(f"⚠️  Ignoring Parquet cache {parquet_file}: {e}")
+
+        # A list (not a callable) makes read_csv raise if a column is missing
+        df = pd.read_csv(
+            csv_file,
+            usecols=list(MERGED_GRADE_COLUMNS),
+            dtype=MERGED_GRADE_DTYPES,
+        )
+
+        if use_parquet_cache:
+            _write_parquet_atomic(df, parquet_file)
+
+        return df
+
+    @classmethod
+    @lru_cache(maxsize=256)
+    def _grade_to_points(cls, grade: str) -> float:
+        """Convert letter or numeric grade to points (memoized per distinct grade)"""
+        points = cls._GRADE_POINTS_BY_RAW.get(grade)
+        if points is None:
+            points = cls.GRADE_POINTS.get(str(grade).strip().upper(), 0.0)
+        return points
 
     def _is_passing(self, grade: str) -> bool:
         """Check if grade is passing (not F)"""
@@ -119,57 +417,36 @@ class MergedGPACalculator:
         Returns:
             (gpa, credits_attempted, credits_earned)
         """
-        # Get student's courses (include ALL for credit totals)
-        student_df = self.df[self.df["User ID"] == user_id].copy()
-
-        # Filter by year if specified
+        # Get student's courses (include ALL for credit totals), for one year
+        # if specified
         if academic_year:
-            student_df = student_df[student_df["Academic Year"] == academic_year]
+            rows = self._rows_by_user_year.get((user_id, academic_year))
+        else:
+            rows = self._rows_by_user.get(user_id)
 
-        if len(student_df) == 0:
+        if rows is None:
             return 0.0, 0.0, 0.0
 
-        # Calculate GPA and Credits
-        total_gpa_points = 0.0
-        total_gpa_credits = 0.0
-
-        total_credits_attempted = 0.0
-        total_credits_earned = 0.0
-
-        for _, course in student_df.iterrows():
-            # Get credits for this course
-            try:
-                credits = float(course["Credit Earned"])
-            except (ValueError, TypeError):
-                credits = 0.0
-
-            total_credits_attempted += credits
-
-            # GPA Calculation - filter by core_only flag
-            include_in_gpa = True
-            if core_only:
-                include_in_gpa = course["CORE"] == "Yes"
-
-            if include_in_gpa:
-                # Get grade points
-                base_points = self._grade_to_points(course["Grade Earned"])
-
-                # Add weight
-                if weighted:
-                    try:
-                        weight = float(course["Weight"]) if pd.notna(course["Weight"]) else 0.0
-                    except (ValueError, TypeError):
-                        weight = 0.0
-                    points = base_points + weight
-                else:
-                    points = base_points
-
-                total_gpa_points += points * credits
-                total_gpa_credits += credits
-
-            # Credits Earned (ALL PASSING COURSES)
-            if self._is_passing(course["Grade Earned"]):
-                total_credits_earned += credits
+        # Calculate GPA and Credits from the arrays parsed at load time
+        # (float() so round() below is Python's, not numpy's, on the fallback)
+        (
+            total_gpa_points,
+            total_gpa_credits,
+            total_credits_attempted,
+            total_credits_earned,
+        ) = map(
+            float,
+            _student_totals(
+                self._grade_codes[rows],
+                self._points_lut,
+                self._credits[rows],
+                self._weights[rows],
+                self._is_core[rows],
+                self._passing[rows],
+                weighted,
+                core_only,
+            ),
+        )
 
         # Calculate GPA
         gpa = total_gpa_points / total_gpa_credits if total_gpa_credits > 0 else 0.0
@@ -185,21 +462,65 @@ class MergedGPACalculator:
         Returns:
             dict mapping year -> (gpa, credits)
         """
-        # Get unique academic years for this student
-        student_df = self.df[
-            (self.df["User ID"] == user_id) & (self.df["CORE"] == "Yes")
-        ]
+        # All students' terms are computed together on first use, then sliced
+        return dict(self._term_gpa_table(weighted).get(user_id, {}))
 
-        years = sorted(student_df["Academic Year"].unique())
+    def _term_gpa_table(
+        self, weighted: bool
+    ) -> Dict[int, Dict[str, Tuple[float, float]]]:
+        """
+        Term GPAs for every student in one grouped pass (cached per weighting)
 
-        term_gpas = {}
-        for year in years:
-            gpa, credits_attempted, credits_earned = self.calculate_gpa(
-                user_id, academic_year=year, weighted=weighted
+        Same rules as calculate_gpa(user_id, academic_year=year): GPA over CORE
+        courses, credits over all courses. Only years with a CORE course appear.
+
+        Returns:
+            dict mapping user_id -> {year: (gpa, credits)}
+        """
+        if weighted in self._term_gpa_tables:
+            return self._term_gpa_tables[weighted]
+
+        df = self.df
+        grouped = df.groupby(["User ID", "Academic Year"], sort=True)
+        terms = grouped.size().index
+        term_codes = grouped.ngroup()
+        in_term = term_codes.notna().to_numpy()
+        term_codes = term_codes.to_numpy()[in_term].astype(np.int64)
+
+        def per_term(values: np.ndarray) -> np.ndarray:
+            return np.bincount(
+                term_codes, weights=values[in_term], minlength=len(terms)
             )
-            term_gpas[year] = (gpa, credits_attempted)
 
-        return term_gpas
+        grade_points = self._points_lut[self._grade_codes]
+        points = grade_points + self._weights if weighted else grade_points
+        credits = self._credits
+        is_core = self._is_core
+        gpa_credits = np.where(is_core, credits, 0.0)
+
+        core_courses = per_term(is_core.astype(float))
+        total_gpa_points = per_term(points * gpa_credits)
+        total_gpa_credits = per_term(gpa_credits)
+        credits_attempted = per_term(credits)
+        gpas = np.divide(
+            total_gpa_points,
+            total_gpa_credits,
+            out=np.zeros(len(terms)),
+            where=total_gpa_credits > 0,
+        )
+
+        table: Dict[int, Dict[str, Tuple[float, float]]] = {}
+        for (user_id, year), has_core, gpa, attempted in zip(
+            terms, core_courses > 0, gpas.tolist(), credits_attempted.tolist()
+        ):
+            if has_core:
+                table.setdefault(user_id, {})[year] = (
+                    round(gpa, 6),
+                    round(attempted, 2),
+                )
+
+        self._term_gpa_tables[weighted] = table
+        return table
 
     def calculate_cumulative_gpa(
         self, user_id: int, weighted: bool = True, core_only: bool = True
@@ -215,45 +536,162 @@ class MergedGPACalculator:
         Returns:
             dict with 'gpa', 'credits_attempted', 'credits_earned'
         """
-        gpa, credits_attempted, credits_earned = self.calculate_gpa(
-            user_id, academic_year=None, weighted=weighted, core_only=core_only
-        )
-
-        return {
-            "gpa": gpa,
-            "credits_attempted": credits_attempted,
-            "credits_earned": credits_earned,
-        }
-
-    def calculate_all_students(self, weighted: bool = True) -> pd.DataFrame:
+        # Reports ask for the same student repeatedly; compute each variant once
+        key = (user_id, weighted, core_only)
+        cumulative = self._cumulative_cache.get(key)
+        if cumulative is None:
+            gpa, credits_attempted, credits_earned = self.calculate_gpa(
+                user_id, academic_year=None, weighted=weighted, core_only=core_only
+            )
+            cumulative = {
+                "gpa": gpa,
+                "credits_attempted": credits_attempted,
+                "credits_earned": credits_earned,
+            }
+            self._cumulative_cache[key] = cumulative
+
+        return dict(cumulative)
+
+    def calculate_all_students(
+        self, weighted: bool = True, backend: str = "pandas"
+    ) -> pd.DataFrame:
         """
         Calculate cumulative GPA for all students
 
+        Args:
+            weighted: True for weighted GPA, False for unweighted
+            backend: "pandas" uses the arrays parsed at load; "polars" re-scans the
+                CSV with a lazy Polars pipeline (requires polars)
+
         Returns:
             DataFrame with columns: User ID, First Name, Last Name, GPA, Credits Attempted, Credits Earned
         """
-        results = []
-
-        student_ids = self.df["User ID"].unique()
-        for user_id in student_ids:
-            # Get student info
-            student_info = self.df[self.df["User ID"] == user_id].iloc[0]
-
-            # Calculate cumulative GPA
-            cum = self.calculate_cumulative_gpa(user_id, weighted=weighted)
-
-            results.append(
-                {
-                    "User ID": user_id,
-                    "First Name": student_info["First Name"],
-                    "Last Name": student_info["Last Name"],
-                    "Cumulative GPA": cum["gpa"],
-                    "Credits Attempted": cum["credits_attempted"],
-                    "Credits Earned": cum["credits_earned"],
-                }
+        if backend == "polars":
+            return self._calculate_all_students_polars(weighted)
+        if backend != "pandas":
+            raise ValueError(f"Unknown backend: {backend!r}")
+
+        # Same rules as calculate_cumulative_gpa(core_only=True), for every
+        # student in one parallel pass instead of one lookup per student
+        order = self._row_order
+        totals = _roster_totals(
+            self._student_offsets,
+            self._grade_codes[order],
+            self._points_lut,
+            self._credits[order],
+            self._weights[order],
+            self._is_core[order],
+            self._passing[order],
+            weighted,
+            True,
+        )
+
+        # Student info comes from each student's first row
+        first_rows = self.df.iloc[order[self._student_offsets[:-1]]]
+
+        return self._roster_results(
+            self._student_ids,
+            first_rows["First Name"].to_numpy(),
+            first_rows["Last Name"].to_numpy(),
+            *totals.T,
+        )
+
+    def _calculate_all_students_polars(self, weighted: bool) -> pd.DataFrame:
+        """calculate_all_students() as one lazy Polars scan -> group_by pipeline"""
+        if not POLARS_AVAILABLE:
+            raise ImportError("backend='polars' requires polars (pip install polars)")
+
+        def to_float(column: str) -> "pl.Expr":
+            return (
+                pl.col(column)
+                .str.strip_chars()
+                .cast(pl.Float64, strict=False)
+                .fill_null(0.0)
+            )
+
+        # Raw columns read as strings so parsing follows the same rules as load
+        raw_columns = ("Grade Earned", "Credit Earned", "Weight", "CORE")
+        lf = pl.scan_csv(
+            self.merged_grades_path,
+            schema_overrides={column: pl.String for column in raw_columns},
+        ).with_columns(
+            pl.col("Grade Earned")
+            .str.strip_chars()
+            .str.to_uppercase()
+            .replace_strict(self.GRADE_POINTS, default=0.0, return_dtype=pl.Float64)
+            .fill_null(0.0)
+            .alias("_grade_points"),
+            to_float("Credit Earned").alias("_credits"),
+            to_float("Weight").alias("_weight"),
+            (pl.col("CORE") == "Yes").fill_null(False).alias("_is_core"),
+        )
+
+        grade_points = pl.col("_grade_points")
+        points = grade_points + pl.col("_weight") if weighted else grade_points
+        gpa_credits = (
+            pl.when(pl.col("_is_core")).then(pl.col("_credits")).otherwise(0.0)
+        )
+
+        totals = (
+            lf.group_by("User ID", maintain_order=True)
+            .agg(
+                pl.col("First Name").first(),
+                pl.col("Last Name").first(),
+                (points * gpa_credits).sum().alias("gpa_points"),
+                gpa_credits.sum().alias("gpa_credits"),
+                pl.col("_credits").sum().alias("credits_attempted"),
+                pl.col("_credits")
+                .filter(grade_points > 0.0)
+                .sum()
+                .alias("credits_earned"),
             )
+            .collect()
+        )
+
+        return self._roster_results(
+            totals["User ID"].to_numpy(),
+            totals["First Name"].to_numpy(),
+            totals["Last Name"].to_numpy(),
+            totals["gpa_points"].to_numpy(),
+            totals["gpa_credits"].to_numpy(),
+            totals["credits_attempted"].to_numpy(),
+            totals["credits_earned"].to_numpy(),
+        )
+
+    def _roster_results(
+        self,
+        user_ids: np.ndarray,
+        first_names: np.ndarray,
+        last_names: np.ndarray,
+        gpa_points: np.ndarray,
+        gpa_credits: np.ndarray,
+        credits_attempted: np.ndarray,
+        credits_earned: np.ndarray,
+    ) -> pd.DataFrame:
+        """Shape per-student totals into the calculate_all_students() report"""
+        gpas = np.divide(
+            gpa_points,
+            gpa_credits,
+            out=np.zeros(len(gpa_points)),
+            where=gpa_credits > 0,
+        )
+
+        results = pd.DataFrame(
+            {
+                "User ID": user_ids,
+                "First Name": first_names,
+                "Last Name": last_names,
+                "Cumulative GPA": [round(gpa, 6) for gpa in gpas.tolist()],
+                "Credits Attempted": [
+                    round(total, 2) for total in credits_attempted.tolist()
+                ],
+                "Credits Earned": [
+                    round(total, 2) for total in credits_earned.tolist()
+                ],
+            }
+        )
 
-        return pd.DataFrame(results).sort_values("Cumulative GPA", ascending=False)
+        return results.sort_values("Cumulative GPA", ascending=False)
 
 
 if __name__ == "__main__":
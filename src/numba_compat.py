@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+Optional Numba Support
+JIT decorators shared by the GPA calculators; without numba installed the
+decorated functions run as plain Python
+"""
+
+import os
+
+try:
+    import numba
+    from numba import njit, prange
+
+    NUMBA_AVAILABLE = True
+
+    # Batch transcript runs fork worker processes (see transcript_generator),
+    # and a process that has started the TBB threading layer can hang at exit
+    # once it has forked. The parallel kernels are only ever launched from one
+    # thread at a time, so the fork-safe workqueue layer is enough.
+    if "NUMBA_THREADING_LAYER" not in os.environ:
+        numba.config.THREADING_LAYER = "workqueue"
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit when numba is not installed"""
+
+        def decorator(func):
+            return func
+
+        return decorator
+
+
+__all__ = ["NUMBA_AVAILABLE", "njit", "prange"]
@@ -24,15 +24,24 @@ Priority: HIGH - Core transcript generation
 Dependencies: Jinja2, WeasyPrint, ReportLab, data_processor, gpa_calculator
 """
 
+import multiprocessing
 import os
+import re
 import sys
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from io import BytesIO
+from operator import attrgetter
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 import logging
 
 # Template engine
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+from jinja2 import Environment, FileSystemLoader, Template, select_autoescape
 
 # PDF generation
 try:
@@ -44,24 +53,174 @@ except ImportError:
     print("WeasyPrint not available - install for PDF generation")
 
 # Import our modules
+import numpy as np
 import pandas as pd
 from data_processor import TranscriptDataProcessor
 from gpa_calculator import GPACalculator
 from class_rank_calculator import ClassRankCalculator
+from data_models import WeightInfo
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Grade columns read into CourseGrade, in _build_course_grades() unpack order
+_COURSE_GRADE_COLUMNS = (
+    "User ID",
+    "First Name",
+    "Last Name",
+    "Grad Year",
+    "School Year",
+    "Course Code",
+    "Course Title",
+    "Course ID",
+    "Course part number",
+    "Term name",
+    "Grade",
+    "Credits attempted",
+    "Credits earned",
+    "Is Honors Detected",
+)
+# Values used when an optional grade column is absent from the export
+_OPTIONAL_GRADE_DEFAULTS = {
+    "Credits attempted": "",
+    "Credits earned": "",
+    "Is Honors Detected": False,
+}
+
+
+# Weight info for courses missing from the weight index - immutable, so one
+# instance is shared by every unindexed course
+_DEFAULT_WEIGHT = WeightInfo(credit=0.0)
+
+# Middle school courses that earn HS credit
+MS_HS_COURSES = (
+    "Algebra 1",
+    "Geometry",
+    "Physical Science",
+    "Spanish I",
+    "Spanish II",
+    "French I",
+    "French II",
+    "Latin I",
+    "Latin II",
+)
+# One case-insensitive pass over a title instead of a lowercased substring
+# test per course name
+_MS_HS_COURSE_RE = re.compile(
+    "|".join(re.escape(course) for course in MS_HS_COURSES), re.IGNORECASE
+)
+
+
+@lru_cache(maxsize=64)
+def _school_year_end(school_year: str) -> Optional[int]:
+    """
+    End year of a "YYYY-YYYY" school year (None if not in that form)
+
+    Memoized: a batch only ever sees a handful of distinct school years.
+    """
+    year_parts = school_year.split("-")
+    if len(year_parts) != 2:
+        return None
+    return int(year_parts[1])
+
+
+@dataclass(slots=True)
+class _CourseEntry:
+    """
+    One course-year on a transcript, semesters side by side
+
+    Templates read fields as attributes (course.course_title), which Jinja
+    also resolves for subscript access.
+    """
+
+    course_code: str
+    course_title: Any
+    school_year: Any
+    sem1_grade: Any = None
+    sem2_grade: Any = None
+    weight: Any = _DEFAULT_WEIGHT
+    is_core: bool = False
+    grade_level: Optional[int] = None
+    display_year: Any = None
+    credits: float = 0.0
+
+
+# Generator used by batch worker processes: the parent's own (inherited when
+# workers are forked) or one built by _init_worker
+_worker_generator: Optional["TranscriptGenerator"] = None
+
+
+def _init_worker(
+    project_root: Path,
+    debug: bool,
+    gpa_calculator: Any,
+    rank_calculator: Any,
+    gpa_results: Dict[int, Any],
+    batch_timestamp: str,
+    batch_issue_date: str,
+) -> None:
+    """
+    Build a worker-local generator when workers can't be forked
+
+    The worker reloads the CSVs but takes the parent's pre-calculated GPAs
+    instead of recalculating the whole roster.
+
+    Args:
+        project_root: Path to project root directory
+        debug: Parent generator's debug setting
+        gpa_calculator: GPA calculator configured by the parent generator
+        rank_calculator: Class rank calculator from the parent (or None)
+        gpa_results: Parent data processor's gpa_results
+        batch_timestamp: Verification-code timestamp shared by the batch
+        batch_issue_date: Issue date shared by the batch
+    """
+    global _worker_generator
+
+    _worker_generator = TranscriptGenerator(project_root, debug=debug)
+    _worker_generator.data_processor.load_all_data(calculate_gpas=False)
+    _worker_generator.data_processor.gpa_results = gpa_results
+    _worker_generator.gpa_calculator = gpa_calculator
+    _worker_generator.rank_calculator = rank_calculator
+    _worker_generator._batch_timestamp = batch_timestamp
+    _worker_generator._batch_issue_date = batch_issue_date
+
+
+def _generate_chunk(
+    user_ids: List[int], transcript_type: str, layout: str
+) -> List[Tuple[int, Optional[Path], Optional[str]]]:
+    """
+    Generate a run of transcripts on the worker's generator
+
+    Returns:
+        (user_id, output_path, error) per student, in order - exactly one of
+        output_path/error is set
+    """
+    results = []
+    for user_id in user_ids:
+        try:
+            output_path = _worker_generator.generate_transcript(
+                user_id, transcript_type, layout=layout
+            )
+        except Exception as e:
+            results.append((user_id, None, str(e)))
+        else:
+            results.append((user_id, output_path, None))
+    return results
+
 
 class TranscriptGenerator:
     """Generate professional PDF transcripts"""
 
-    def __init__(self, project_root: Optional[Path] = None):
+    def __init__(
+        self, project_root: Optional[Path] = None, debug: Optional[bool] = None
+    ):
         """
         Initialize transcript generator
 
         Args:
             project_root: Path to project root directory
+            debug: Save the rendered HTML next to each PDF (default: the
+                TRANSCRIPT_DEBUG=1 environment variable)
         """
         if project_root is None:
             self.project_root = Path(__file__).parent.parent
@@ -71,12 +230,48 @@ class TranscriptGenerator:
         self.templates_dir = self.project_root / "templates"
         self.output_dir = self.project_root / "output"
         self.assets_dir = self.project_root / "assets"
+        self._base_url = str(self.templates_dir)
+
+        # School information merged into every transcript (customize these)
+        self._school_info = {
+            "school_name": "Keswick Christian School",
+            "school_address": "8585 66th Street North, Pinellas Park, FL 33782",
+            "school_phone": "(727) 522-5115",
+            "school_website": "www.keswickchristian.org",
+            "registrar_name": "Dr. School Registrar",
+            "school_logo_path": str(self.assets_dir / "logos" / "school_logo.png"),
+        }
+        self._landscape_school_info = {
+            **self._school_info,
+            "registrar_name": "School Registrar",
+            "school_logo_path": str(self.assets_dir / "logos" / "text logo kcs.png"),
+        }
+
+        if debug is None:
+            debug = os.environ.get("TRANSCRIPT_DEBUG") == "1"
+        self.debug = debug
 
-        # Initialize Jinja2 environment
+        # Initialize Jinja2 environment. Templates don't change while a batch
+        # runs, so skip the per-render mtime check and never evict compiled ones.
         self.env = Environment(
             loader=FileSystemLoader(str(self.templates_dir)),
             autoescape=select_autoescape(["html", "xml"]),
+            auto_reload=False,
+            cache_size=-1,
         )
+        # Compiled templates by name, filled on first render of each layout
+        self._templates: Dict[str, Template] = {}
+        # Parsed WeasyPrint stylesheets by path, filled on first PDF per layout.
+        # One cache per thread: batch PDF writer threads never share a CSS
+        # object (see _stylesheet)
+        self._css_local = threading.local()
+        # Set for the duration of generate_batch_transcripts() so every
+        # transcript in a batch shares one issue date / verification timestamp
+        self._batch_timestamp: Optional[str] = None
+        self._batch_issue_date: Optional[str] = None
+        # Data processor table name -> (frame, row positions by User ID); see
+        # _user_rows()
+        self._user_row_index: Dict[str, Tuple[pd.DataFrame, Dict[Any, Any]]] = {}
 
         # Add custom filter to list dictionary keys
         def list_keys_filter(d):
@@ -116,56 +311,50 @@ class TranscriptGenerator:
         Returns:
             Path to generated PDF file
         """
-        logger.info(f"📄 Generating {transcript_type} transcript for student {user_id}")
+        template_data, output_path = self._prepare_transcript(
+            user_id, transcript_type, output_filename, layout
+        )
 
-        # Load student data from dataframe
-        student_df = self.data_processor.student_details[
-            self.data_processor.student_details["User ID"] == user_id
-        ]
+        if WEASYPRINT_AVAILABLE:
+            # Render HTML straight into the buffer WeasyPrint reads from
+            html_file = self._render_html_stream(template_data, layout)
+            self._generate_pdf_weasyprint(html_file, output_path, layout)
+        else:
+            # Fallback: save HTML for manual conversion
+            html_content = self._render_html(template_data, layout)
+            html_path = output_path.with_suffix(".html")
+            html_path.write_text(html_content, encoding="utf-8")
+            logger.warning(f"WeasyPrint not available - saved HTML to {html_path}")
+            return html_path
 
-        if len(student_df) == 0:
-            raise ValueError(f"Student {user_id} not found")
+        logger.info(f"✅ Transcript generated: {output_path}")
+        return output_path
 
-        student_record = student_df.iloc[0].to_dict()
+    def _prepare_transcript(
+        self,
+        user_id: int,
+        transcript_type: str,
+        output_filename: Optional[str],
+        layout: str,
+    ) -> Tuple[Dict[str, Any], Path]:
+        """
+        Gather one student's template data and PDF path (generate_transcript
+        up to rendering)
 
-        # Get student grades as list of dicts
-        student_grades_df = self.data_processor.grades[
-            self.data_processor.grades["User ID"] == user_id
-        ]
+        Returns:
+            (template_data, output_path) - the output directory already exists
+        """
+        logger.info(f"📄 Generating {transcript_type} transcript for student {user_id}")
 
-        # Convert to list for GPA calculator
-        from data_models import CourseGrade
+        # Load student data from dataframe
+        student_record = self._student_record(user_id)
 
-        course_grades = []
-        for _, row in student_grades_df.iterrows():
-            try:
-                grade = CourseGrade(
-                    user_id=int(row["User ID"]),
-                    first_name=row["First Name"],
-                    last_name=row["Last Name"],
-                    grad_year=int(row["Grad Year"]),
-                    school_year=row["School Year"],
-                    course_code=str(row["Course Code"]),
-                    course_title=row["Course Title"],
-                    course_id=(
-                        int(row["Course ID"])
-                        if pd.notna(row.get("Course ID"))
-                        else None
-                    ),
-                    course_part_number=str(row["Course part number"]),
-                    term_name=row["Term name"],
-                    grade=str(row["Grade"]),
-                    credits_attempted=str(row.get("Credits attempted", "")),
-                    credits_earned=str(row.get("Credits earned", "")),
-                    is_honors_detected=bool(row.get("Is Honors Detected", False)),
-                )
-                course_grades.append(grade)
-            except Exception as e:
-                logger.warning(f"Skipping grade record: {e}")
-                continue
+        if student_record is None:
+            raise ValueError(f"Student {user_id} not found")
 
         # Get GPA from pre-calculated results (transfer grades included)
-        # Fall back to on-the-fly calculation only if not available
+        # Fall back to on-the-fly calculation only if not available - the
+        # CourseGrade list it needs is only built on that path
         if user_id in self.data_processor.gpa_results:
             gpa = self.data_processor.gpa_results[user_id]
             logger.info(
@@ -177,6 +366,9 @@ class TranscriptGenerator:
                 f"⚠️  No pre-calculated GPA for student {user_id}, "
                 f"calculating on-the-fly"
             )
+            course_grades = self._build_course_grades(
+                self._user_rows("grades", user_id)
+            )
             gpa = self.gpa_calculator.calculate_student_gpa(user_id, course_grades)
 
         # Calculate class rank
@@ -209,10 +401,7 @@ class TranscriptGenerator:
                 student_record, gpa, class_rank, transcript_type
             )
 
-        # Render HTML
-        html_content = self._render_html(template_data, layout)
-
-        # Generate PDF
+        # Output location
         if output_filename is None:
             last_name = student_record.get(
                 "Last name", student_record.get("last_name", "Student")
@@ -227,18 +416,196 @@ class TranscriptGenerator:
         # Ensure output directory exists
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
-        if WEASYPRINT_AVAILABLE:
-            self._generate_pdf_weasyprint(html_content, output_path, layout)
-        else:
-            # Fallback: save HTML for manual conversion
-            html_path = output_path.with_suffix(".html")
-            with open(html_path, "w", encoding="utf-8") as f:
-                f.write(html_content)
-            logger.warning(f"WeasyPrint not available - saved HTML to {html_path}")
-            return html_path
+        return template_data, output_path
 
-        logger.info(f"✅ Transcript generated: {output_path}")
-        return output_path
+    def _user_row_positions(
+        self, table: str, user_id: int
+    ) -> Tuple[pd.DataFrame, Optional[np.ndarray]]:
+        """
+        Row positions of one student in a data processor table
+
+        The table is grouped by "User ID" once and the row positions reused,
+        instead of a full boolean scan per lookup. The index is rebuilt
+        whenever the data processor swaps in a new frame (e.g. load_all_data).
+
+        Args:
+            table: Data processor attribute name ("grades", "student_details")
+            user_id: Student ID
+
+        Returns:
+            (table frame, the student's row positions or None if absent)
+        """
+        frame = getattr(self.data_processor, table)
+        cached = self._user_row_index.get(table)
+        if cached is None or cached[0] is not frame:
+            cached = (frame, frame.groupby("User ID", sort=False).indices)
+            self._user_row_index[table] = cached
+
+        return frame, cached[1].get(user_id)
+
+    def _user_rows(self, table: str, user_id: int) -> pd.DataFrame:
+        """Rows of a data processor table belonging to one student (may be empty)"""
+        frame, rows = self._user_row_positions(table, user_id)
+        if rows is None:
+            return frame.iloc[:0]
+        return frame.iloc[rows]
+
+    def _student_record(self, user_id: int) -> Optional[Dict[str, Any]]:
+        """First student_details row for a student as a dict, or None"""
+        frame, rows = self._user_row_positions("student_details", user_id)
+        if rows is None:
+            return None
+        return frame.iloc[rows[0]].to_dict()
+
+    def _build_course_grades(
+        self,
+        student_grades_df: pd.DataFrame,
+        detect_honors: bool = True,
+        log_skipped: bool = True,
+    ) -> List[Any]:
+        """
+        Convert a student's grade rows to CourseGrade objects
+
+        Walks plain column tuples (itertuples) rather than per-row Series.
+        Rows that fail conversion/validation are skipped.
+
+        Args:
+            student_grades_df: Grade rows for one student
+            detect_honors: Carry the "Is Honors Detected" flag onto each grade
+            log_skipped: Log a warning for each skipped row
+
+        Returns:
+            List of CourseGrade objects
+        """
+        from data_models import CourseGrade
+
+        # Without a required column no row can convert - skip them all, as the
+        # per-row lookups did. Course ID may be absent (None); optional columns
+        # take their defaults.
+        missing = [
+            column
+            for column in _COURSE_GRADE_COLUMNS
+            if column not in student_grades_df.columns
+            and column != "Course ID"
+            and column not in _OPTIONAL_GRADE_DEFAULTS
+        ]
+        if missing:
+            if log_skipped:
+                for _ in range(len(student_grades_df)):
+                    logger.warning(f"Skipping grade record: {KeyError(missing[0])}")
+            return []
+
+        frame = student_grades_df.reindex(columns=list(_COURSE_GRADE_COLUMNS))
+        for column, default in _OPTIONAL_GRADE_DEFAULTS.items():
+            if column not in student_grades_df.columns:
+                frame[column] = default
+        has_course_id = frame["Course ID"].notna().to_numpy()
+
+        course_grades = []
+        for (
+            user_id,
+            first_name,
+            last_name,
+            grad_year,
+            school_year,
+            course_code,
+            course_title,
+            course_id,
+            course_part_number,
+            term_name,
+            grade,
+            credits_attempted,
+            credits_earned,
+            is_honors_detected,
+        ), course_id_present in zip(
+            frame.itertuples(index=False, name=None), has_course_id
+        ):
+            try:
+                course_grades.append(
+                    CourseGrade(
+                        user_id=int(user_id),
+                        first_name=first_name,
+                        last_name=last_name,
+                        grad_year=int(grad_year),
+                        school_year=school_year,
+                        course_code=str(course_code),
+                        course_title=course_title,
+                        course_id=int(course_id) if course_id_present else None,
+                        course_part_number=str(course_part_number),
+                        term_name=term_name,
+                        grade=str(grade),
+                        credits_attempted=str(credits_attempted),
+                        credits_earned=str(credits_earned),
+                        is_honors_detected=(
+                            bool(is_honors_detected) if detect_honors else False
+                        ),
+                    )
+                )
+            except Exception as e:
+                if log_skipped:
+                    logger.warning(f"Skipping grade record: {e}")
+
+        return course_grades
+
+    def _build_year_course_map(
+        self, student_grades_df: pd.DataFrame
+    ) -> Dict[Any, Dict[str, "_CourseEntry"]]:
+        """
+        Combine a student's semester rows into one entry per course per year
+
+        Courses are keyed by (School Year, Course Code) with pandas
+        de-duplication rather than a per-row dict walk. Years and courses keep
+        first-appearance order; the title comes from a course's first row and,
+        when a semester repeats, its last grade wins.
+
+        Args:
+            student_grades_df: Grade rows for one student
+
+        Returns:
+            {school_year: {course_code: _CourseEntry}}
+        """
+        keyed = pd.DataFrame(
+            {
+                "year": student_grades_df["School Year"].to_numpy(),
+                "code": student_grades_df["Course Code"].map(str).to_numpy(),
+                "semester": student_grades_df["Course part number"]
+                .astype(int)
+                .to_numpy(),
+                "title": student_grades_df["Course Title"].to_numpy(),
+                "grade": student_grades_df["Grade"].to_numpy(),
+            }
+        )
+
+        semester_rows = keyed[keyed["semester"].isin((1, 2))].drop_duplicates(
+            ["year", "code", "semester"], keep="last"
+        )
+        semester_grades = dict(
+            zip(
+                zip(
+                    semester_rows["year"],
+                    semester_rows["code"],
+                    semester_rows["semester"],
+                ),
+                semester_rows["grade"],
+            )
+        )
+
+        weights_index = self.gpa_calculator.course_weights_index
+        year_course_map = {}
+        for year, course_code, title in keyed.drop_duplicates(["year", "code"])[
+            ["year", "code", "title"]
+        ].itertuples(index=False, name=None):
+            weight_info = weights_index.get(course_code)
+            year_course_map.setdefault(year, {})[course_code] = _CourseEntry(
+                course_code=course_code,
+                course_title=title,
+                school_year=year,
+                sem1_grade=semester_grades.get((year, course_code, 1)),
+                sem2_grade=semester_grades.get((year, course_code, 2)),
+                weight=weight_info if weight_info else _DEFAULT_WEIGHT,
+            )
+
+        return year_course_map
 
     def _prepare_template_data(
         self,
@@ -262,59 +629,17 @@ class TranscriptGenerator:
         courses_by_year = {}
 
         # Get grades for this student
-        student_grades_df = self.data_processor.grades[
-            self.data_processor.grades["User ID"] == student_id
-        ]
+        student_grades_df = self._user_rows("grades", student_id)
 
         # Group courses by year and course code to combine semesters
-        year_course_map = {}
-
-        for _, grade_row in student_grades_df.iterrows():
-            year = grade_row["School Year"]
-            course_code = str(grade_row["Course Code"])
-            semester = int(grade_row["Course part number"])
-
-            if year not in year_course_map:
-                year_course_map[year] = {}
-
-            if course_code not in year_course_map[year]:
-                # Get weight info
-                weight_info = self.gpa_calculator.course_weights_index.get(course_code)
-
-                year_course_map[year][course_code] = {
-                    "course_code": course_code,
-                    "course_title": grade_row["Course Title"],
-                    "sem1_grade": None,
-                    "sem2_grade": None,
-                    "weight": (
-                        weight_info
-                        if weight_info
-                        else type(
-                            "W",
-                            (),
-                            {
-                                "credit": 0.0,
-                                "weight": 0.0,
-                                "is_ap": False,
-                                "is_honors": False,
-                            },
-                        )()
-                    ),
-                }
-
-            # Assign grade to appropriate semester
-            if semester == 1:
-                year_course_map[year][course_code]["sem1_grade"] = grade_row["Grade"]
-            elif semester == 2:
-                year_course_map[year][course_code]["sem2_grade"] = grade_row["Grade"]
+        year_course_map = self._build_year_course_map(student_grades_df)
 
         # Convert to final structure with grade levels
         for year in sorted(year_course_map.keys(), reverse=True):
             # Calculate grade level for this year
             # Example: "2023-2024" -> extract 2024, compare with grad_year
-            year_parts = year.split("-")
-            if len(year_parts) == 2:
-                end_year = int(year_parts[1])
+            end_year = _school_year_end(year)
+            if end_year is not None:
                 grade_level = (
                     12 - (grad_year - end_year) if grad_year else current_grade
                 )
@@ -326,16 +651,6 @@ class TranscriptGenerator:
                 "courses": list(year_course_map[year].values()),
             }
 
-        # School information (customize these)
-        school_info = {
-            "school_name": "Keswick Christian School",
-            "school_address": "8585 66th Street North, Pinellas Park, FL 33782",
-            "school_phone": "(727) 522-5115",
-            "school_website": "www.keswickchristian.org",
-            "registrar_name": "Dr. School Registrar",
-            "school_logo_path": str(self.assets_dir / "logos" / "school_logo.png"),
-        }
-
         template_data = {
             # Student information
             "student": student_record,
@@ -351,25 +666,25 @@ class TranscriptGenerator:
             "awards_by_year": {},
             # Document metadata
             "transcript_type": transcript_type,
-            "issue_date": datetime.now().strftime("%B %d, %Y"),
+            "issue_date": self._issue_date(),
             "verification_code": self._generate_verification_code(
                 student_record["User ID"]
             ),
             # School information
-            **school_info,
+            **self._school_info,
         }
 
         return template_data
 
-    def _sort_courses_core_first(self, courses: List[Dict]) -> List[Dict]:
+    def _sort_courses_core_first(
+        self, courses: List["_CourseEntry"]
+    ) -> List["_CourseEntry"]:
         """Sort courses with CORE courses first, then alphabetically"""
-        core_courses = [c for c in courses if c.get("is_core", False)]
-        non_core = [c for c in courses if not c.get("is_core", False)]
-
-        core_courses.sort(key=lambda x: x["course_title"])
-        non_core.sort(key=lambda x: x["course_title"])
-
-        return core_courses + non_core
+        # Two C-level keyed sorts: alphabetical, then a stable core-first pass
+        # (reverse=True keeps equal keys in order)
+        courses = sorted(courses, key=attrgetter("course_title"))
+        courses.sort(key=attrgetter("is_core"), reverse=True)
+        return courses
 
     def _prepare_landscape_template_data(
         self,
@@ -390,76 +705,19 @@ class TranscriptGenerator:
         )
 
         # Get grades for this student
-        student_grades_df = self.data_processor.grades[
-            self.data_processor.grades["User ID"] == student_id
-        ]
+        student_grades_df = self._user_rows("grades", student_id)
 
         # Group courses by year and course code to combine semesters
-        year_course_map = {}
-
-        for _, grade_row in student_grades_df.iterrows():
-            year = grade_row["School Year"]
-            course_code = str(grade_row["Course Code"])
-            semester = int(grade_row["Course part number"])
-            course_title = grade_row["Course Title"]
-
-            if year not in year_course_map:
-                year_course_map[year] = {}
-
-            if course_code not in year_course_map[year]:
-                # Get weight info
-                weight_info = self.gpa_calculator.course_weights_index.get(course_code)
-
-                year_course_map[year][course_code] = {
-                    "course_code": course_code,
-                    "course_title": course_title,
-                    "school_year": year,
-                    "sem1_grade": None,
-                    "sem2_grade": None,
-                    "weight": (
-                        weight_info
-                        if weight_info
-                        else type(
-                            "W",
-                            (),
-                            {
-                                "credit": 0.0,
-                                "weight": 0.0,
-                                "is_ap": False,
-                                "is_honors": False,
-                            },
-                        )()
-                    ),
-                }
-
-            # Assign grade to appropriate semester
-            if semester == 1:
-                year_course_map[year][course_code]["sem1_grade"] = grade_row["Grade"]
-            elif semester == 2:
-                year_course_map[year][course_code]["sem2_grade"] = grade_row["Grade"]
+        year_course_map = self._build_year_course_map(student_grades_df)
 
         # Organize by grade level (9, 10, 11, 12, or middle school)
         courses_by_grade = {"9": [], "10": [], "11": [], "12": []}
         middle_school_credits = []
 
-        # Middle school HS credit courses
-        ms_hs_courses = [
-            "Algebra 1",
-            "Geometry",
-            "Physical Science",
-            "Spanish I",
-            "Spanish II",
-            "French I",
-            "French II",
-            "Latin I",
-            "Latin II",
-        ]
-
         for year in sorted(year_course_map.keys()):
             # Calculate grade level for this year
-            year_parts = year.split("-")
-            if len(year_parts) == 2 and grad_year:
-                end_year = int(year_parts[1])
+            end_year = _school_year_end(year) if grad_year else None
+            if end_year is not None:
                 grade_level = 12 - (grad_year - end_year)
             else:
                 grade_level = 12  # default
@@ -469,23 +727,20 @@ class TranscriptGenerator:
             if grade_level < 9:
                 # Middle school - only include HS credit courses
                 for course in courses:
-                    course["grade_level"] = grade_level
-                    course["display_year"] = year
-                    if any(
-                        ms_course.lower() in course["course_title"].lower()
-                        for ms_course in ms_hs_courses
-                    ):
+                    course.grade_level = grade_level
+                    course.display_year = year
+                    if _MS_HS_COURSE_RE.search(course.course_title):
                         middle_school_credits.append(course)
             else:
                 # High school grades 9-12
                 grade_key = str(min(grade_level, 12))  # Cap at 12
                 for course in courses:
                     # Get CORE status from weight info
-                    weight_info = course.get("weight")
-                    course["is_core"] = getattr(weight_info, "core", False)
-                    course["grade_level"] = grade_level
-                    course["display_year"] = year
-                    course["credits"] = getattr(weight_info, "credit", 0.0)
+                    weight_info = course.weight
+                    course.is_core = getattr(weight_info, "core", False)
+                    course.grade_level = grade_level
+                    course.display_year = year
+                    course.credits = getattr(weight_info, "credit", 0.0)
 
                 courses_by_grade[grade_key].extend(courses)
 
@@ -498,16 +753,6 @@ class TranscriptGenerator:
         # Sort middle school credits
         middle_school_credits = self._sort_courses_core_first(middle_school_credits)
 
-        # School information
-        school_info = {
-            "school_name": "Keswick Christian School",
-            "school_address": "8585 66th Street North, Pinellas Park, FL 33782",
-            "school_phone": "(727) 522-5115",
-            "school_website": "www.keswickchristian.org",
-            "registrar_name": "School Registrar",
-            "school_logo_path": str(self.assets_dir / "logos" / "text logo kcs.png"),
-        }
-
         template_data = {
             # Student information
             "student": student_record,
@@ -522,12 +767,12 @@ class TranscriptGenerator:
             "awards": [],
             # Document metadata
             "transcript_type": transcript_type,
-            "issue_date": datetime.now().strftime("%B %d, %Y"),
+            "issue_date": self._issue_date(),
             "verification_code": self._generate_verification_code(
                 student_record["User ID"]
             ),
             # School information
-            **school_info,
+            **self._landscape_school_info,
         }
 
         return template_data
@@ -553,10 +798,8 @@ class TranscriptGenerator:
             self.project_root,
         )
 
-    def _render_html(
-        self, template_data: Dict[str, Any], layout: str = "landscape"
-    ) -> str:
-        """Render HTML from template"""
+    def _get_template(self, layout: str) -> Template:
+        """Compiled template for a layout (loaded once per generator)"""
 
         if layout in ["minimalist", "v5", "v4", "v3"]:
             template_name = "transcript_minimalist.html"
@@ -567,15 +810,45 @@ class TranscriptGenerator:
         else:
             template_name = "transcript_template.html"
 
-        template = self.env.get_template(template_name)
-        html_content = template.render(**template_data)
+        template = self._templates.get(template_name)
+        if template is None:
+            template = self.env.get_template(template_name)
+            self._templates[template_name] = template
+        return template
+
+    def _render_html(
+        self, template_data: Dict[str, Any], layout: str = "landscape"
+    ) -> str:
+        """Render HTML from template"""
+
+        html_content = self._get_template(layout).render(**template_data)
 
         return html_content
 
+    def _render_html_stream(
+        self, template_data: Dict[str, Any], layout: str = "landscape"
+    ) -> BytesIO:
+        """
+        Render HTML from template as UTF-8 into an in-memory file
+
+        Jinja writes the output chunk by chunk, so the full HTML is never also
+        held as one Python string.
+
+        Returns:
+            Buffer positioned at the start of the HTML
+        """
+        html_file = BytesIO()
+        self._get_template(layout).stream(**template_data).dump(
+            html_file, encoding="utf-8"
+        )
+        html_file.seek(0)
+
+        return html_file
+
     def _generate_pdf_weasyprint(
-        self, html_content: str, output_path: Path, layout: str = "landscape"
+        self, html_file: BytesIO, output_path: Path, layout: str = "landscape"
     ):
-        """Generate PDF using WeasyPrint"""
+        """Generate PDF using WeasyPrint from UTF-8 HTML in html_file"""
 
         # Select appropriate CSS based on layout
         if layout in ["minimalist", "v5", "v4", "v3"]:
@@ -588,30 +861,54 @@ class TranscriptGenerator:
             css_path = self.templates_dir / "styles.css"
 
         # Debug: Save HTML for inspection
-        debug_html_path = output_path.with_suffix(".html")
-        with open(debug_html_path, "w", encoding="utf-8") as f:
-            f.write(html_content)
-        logger.info(f"Debug HTML saved: {debug_html_path}")
-
-        if css_path.exists():
-            css = CSS(filename=str(css_path))
-            HTML(string=html_content, base_url=str(self.templates_dir)).write_pdf(
-                output_path, stylesheets=[css]
-            )
+        if self.debug:
+            debug_html_path = output_path.with_suffix(".html")
+            debug_html_path.write_bytes(html_file.getvalue())
+            logger.info(f"Debug HTML saved: {debug_html_path}")
+
+        css = self._stylesheet(css_path)
+
+        html = HTML(file_obj=html_file, base_url=self._base_url, encoding="utf-8")
+        if css is not None:
+            html.write_pdf(output_path, stylesheets=[css])
         else:
             logger.warning(
                 f"CSS file not found: {css_path}, generating without stylesheet"
             )
-            HTML(string=html_content, base_url=str(self.templates_dir)).write_pdf(
-                output_path
-            )
+            html.write_pdf(output_path)
 
         logger.info(f"PDF generated with WeasyPrint ({layout} layout): {output_path}")
 
+    def _stylesheet(self, css_path: Path) -> Optional[Any]:
+        """
+        Parsed stylesheet for css_path, cached per thread
+
+        Each stylesheet is parsed once per thread, not once per transcript.
+        WeasyPrint doesn't document CSS objects as thread-safe, so writer
+        threads each parse their own.
+
+        Returns:
+            WeasyPrint CSS object, or None if the file doesn't exist
+        """
+        css_cache = getattr(self._css_local, "cache", None)
+        if css_cache is None:
+            css_cache = self._css_local.cache = {}
+
+        css = css_cache.get(css_path)
+        if css is None and css_path.exists():
+            css = css_cache[css_path] = CSS(filename=str(css_path))
+        return css
+
+    def _issue_date(self) -> str:
+        """Issue date shown on the transcript (shared by a whole batch)"""
+        if self._batch_issue_date is not None:
+            return self._batch_issue_date
+        return datetime.now().strftime("%B %d, %Y")
+
     def _generate_verification_code(self, user_id: int) -> str:
         """Generate unique verification code for transcript"""
 
-        timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
+        timestamp = self._batch_timestamp or datetime.now().strftime("%Y%m%d%H%M%S")
         code = f"KCS-{user_id}-{timestamp}"
 
         return code
@@ -621,14 +918,27 @@ class TranscriptGenerator:
         user_ids: Optional[List[int]] = None,
         graduation_year: Optional[int] = None,
         transcript_type: str = "Official",
+        max_workers: int = 1,
+        layout: str = "landscape",
+        pdf_threads: int = 1,
     ) -> List[Path]:
         """
         Generate transcripts for multiple students
 
+        By default students are generated one after another in this process.
+        pdf_threads > 1 hands WeasyPrint writes to a thread pool so they
+        overlap the next student's rendering (see _generate_batch_threaded);
+        max_workers > 1 opts into a process pool instead (see
+        _generate_batch_pool).
+
         Args:
             user_ids: List of specific student IDs (optional)
             graduation_year: Generate for all students in graduating class (optional)
             transcript_type: "Official" or "Unofficial"
+            max_workers: Worker processes (default 1: run in this process)
+            layout: Transcript layout, as for generate_transcript()
+            pdf_threads: PDF writer threads for the in-process run (default 1:
+                each PDF is written before the next student is rendered)
 
         Returns:
             List of paths to generated PDF files
@@ -650,13 +960,48 @@ class TranscriptGenerator:
         generated_files = []
         errors = []
 
-        for user_id in user_ids:
-            try:
-                output_path = self.generate_transcript(user_id, transcript_type)
-                generated_files.append(output_path)
-            except Exception as e:
-                logger.error(f"Error generating transcript for student {user_id}: {e}")
-                errors.append((user_id, str(e)))
+        max_workers = min(max_workers, len(user_ids))
+
+        batch_started = datetime.now()
+        self._batch_timestamp = batch_started.strftime("%Y%m%d%H%M%S")
+        self._batch_issue_date = batch_started.strftime("%B %d, %Y")
+
+        try:
+            if max_workers <= 1:
+                if WEASYPRINT_AVAILABLE and pdf_threads > 1:
+                    self._generate_batch_threaded(
+                        user_ids,
+                        transcript_type,
+                        layout,
+                        pdf_threads,
+                        generated_files,
+                        errors,
+                    )
+                else:
+                    for user_id in user_ids:
+                        try:
+                            output_path = self.generate_transcript(
+                                user_id, transcript_type, layout=layout
+                            )
+                            generated_files.append(output_path)
+                        except Exception as e:
+                            logger.error(
+                                f"Error generating transcript for student "
+                                f"{user_id}: {e}"
+                            )
+                            errors.append((user_id, str(e)))
+            else:
+                self._generate_batch_pool(
+                    user_ids,
+                    transcript_type,
+                    layout,
+                    max_workers,
+                    generated_files,
+                    errors,
+                )
+        finally:
+            self._batch_timestamp = None
+            self._batch_issue_date = None
 
         logger.info(f"✅ Batch generation complete")
         logger.info(f"   Successfully generated: {len(generated_files)}")
@@ -669,6 +1014,157 @@ class TranscriptGenerator:
 
         return generated_files
 
+    def _generate_batch_pool(
+        self,
+        user_ids: List[int],
+        transcript_type: str,
+        layout: str,
+        max_workers: int,
+        generated_files: List[Path],
+        errors: List[Tuple[int, str]],
+    ) -> None:
+        """
+        Batch over a process pool, students split into ordered chunks
+
+        Where the platform can fork, workers inherit this generator with its
+        loaded data and warm caches. Otherwise each worker reloads the CSVs
+        once (see _init_worker). If the pool breaks, every student in the
+        affected chunks is recorded as an error and the rest of the batch
+        still reports normally.
+
+        Args:
+            user_ids: Student IDs to generate
+            transcript_type: "Official" or "Unofficial"
+            layout: Transcript layout
+            max_workers: Worker processes
+            generated_files: Receives output paths, in user_ids order
+            errors: Receives (user_id, error) pairs
+        """
+        global _worker_generator
+
+        chunk_size = max(1, len(user_ids) // (4 * max_workers))
+        chunks = [
+            user_ids[start : start + chunk_size]
+            for start in range(0, len(user_ids), chunk_size)
+        ]
+
+        if "fork" in multiprocessing.get_all_start_methods():
+            pool_options = {"mp_context": multiprocessing.get_context("fork")}
+            _worker_generator = self
+        else:
+            pool_options = {
+                "initializer": _init_worker,
+                "initargs": (
+                    self.project_root,
+                    self.debug,
+                    self.gpa_calculator,
+                    self.rank_calculator,
+                    self.data_processor.gpa_results,
+                    self._batch_timestamp,
+                    self._batch_issue_date,
+                ),
+            }
+
+        try:
+            with ProcessPoolExecutor(
+                max_workers=max_workers, **pool_options
+            ) as executor:
+                futures = []
+                for chunk in chunks:
+                    try:
+                        futures.append(
+                            executor.submit(
+                                _generate_chunk, chunk, transcript_type, layout
+                            )
+                        )
+                    except RuntimeError:
+                        # Pool already broken (e.g. a worker failed to start)
+                        futures.append(None)
+
+                for chunk, future in zip(chunks, futures):
+                    try:
+                        if future is None:
+                            raise RuntimeError("worker pool broke before submission")
+                        results = future.result()
+                    except Exception as e:
+                        results = [
+                            (user_id, None, f"worker pool failed: {e}")
+                            for user_id in chunk
+                        ]
+
+                    for user_id, output_path, error in results:
+                        if error is None:
+                            generated_files.append(output_path)
+                        else:
+                            logger.error(
+                                f"Error generating transcript for student "
+                                f"{user_id}: {error}"
+                            )
+                            errors.append((user_id, error))
+        finally:
+            _worker_generator = None
+
+    def _generate_batch_threaded(
+        self,
+        user_ids: List[int],
+        transcript_type: str,
+        layout: str,
+        pdf_threads: int,
+        generated_files: List[Path],
+        errors: List[Tuple[int, str]],
+    ) -> None:
+        """
+        In-process batch: render HTML here, write PDFs on a thread pool
+
+        WeasyPrint releases the GIL for parts of each write, so the next
+        student's data prep/rendering overlaps earlier PDFs. At most
+        2 * pdf_threads rendered documents wait for a writer at once.
+
+        Args:
+            user_ids: Student IDs to generate
+            transcript_type: "Official" or "Unofficial"
+            layout: Transcript layout
+            pdf_threads: Writer threads
+            generated_files: Receives output paths, in user_ids order
+            errors: Receives (user_id, error) pairs
+        """
+        pending = deque()
+
+        def collect_oldest():
+            user_id, output_path, future = pending.popleft()
+            try:
+                future.result()
+            except Exception as e:
+                logger.error(f"Error generating transcript for student {user_id}: {e}")
+                errors.append((user_id, str(e)))
+            else:
+                logger.info(f"✅ Transcript generated: {output_path}")
+                generated_files.append(output_path)
+
+        with ThreadPoolExecutor(max_workers=pdf_threads) as pdf_writer:
+            for user_id in user_ids:
+                try:
+                    template_data, output_path = self._prepare_transcript(
+                        user_id, transcript_type, None, layout
+                    )
+                    html_file = self._render_html_stream(template_data, layout)
+                except Exception as e:
+                    logger.error(
+                        f"Error generating transcript for student {user_id}: {e}"
+                    )
+                    errors.append((user_id, str(e)))
+                    continue
+
+                future = pdf_writer.submit(
+                    self._generate_pdf_weasyprint, html_file, output_path, layout
+                )
+                pending.append((user_id, output_path, future))
+                if len(pending) > 2 * pdf_threads:
+                    collect_oldest()
+
+            while pending:
+                collect_oldest()
+
     def audit_student_layout(self, user_id: int) -> Dict[str, Any]:
         """
         Calculate layout metrics for a student without generating PDF
@@ -680,49 +1176,21 @@ class TranscriptGenerator:
             Dictionary containing layout metrics (effective score, tier, risk)
         """
         # Load student data
-        student_df = self.data_processor.student_details[
-            self.data_processor.student_details["User ID"] == user_id
-        ]
-        
-        if len(student_df) == 0:
+        student_record = self._student_record(user_id)
+
+        if student_record is None:
             return {"error": "Student not found"}
-            
-        student_record = student_df.iloc[0].to_dict()
         
-        # Get grades
-        student_grades_df = self.data_processor.grades[
-            self.data_processor.grades["User ID"] == user_id
-        ]
-        
-        # Convert grades to objects (simplified from generate_transcript)
-        from data_models import CourseGrade
-        course_grades = []
-        for _, row in student_grades_df.iterrows():
-            try:
-                # Minimal fields needed for GPA/structure
-                grade = CourseGrade(
-                    user_id=int(row["User ID"]),
-                    first_name=row["First Name"],
-                    last_name=row["Last Name"],
-                    grad_year=int(row["Grad Year"]),
-                    school_year=row["School Year"],
-                    course_code=str(row["Course Code"]),
-                    course_title=row["Course Title"],
-                    course_id=(int(row["Course ID"]) if pd.notna(row.get("Course ID")) else None),
-                    course_part_number=str(row["Course part number"]),
-                    term_name=row["Term name"],
-                    grade=str(row["Grade"]), 
-                    credits_attempted=str(row.get("Credits attempted", "")),
-                    credits_earned=str(row.get("Credits earned", "")),
-                )
-                course_grades.append(grade)
-            except:
-                continue
-                
-        # Get/Calc GPA
+        # Get/Calc GPA (grades converted to objects only for the fallback,
+        # simplified from generate_transcript)
         if user_id in self.data_processor.gpa_results:
             gpa = self.data_processor.gpa_results[user_id]
         else:
+            course_grades = self._build_course_grades(
+                self._user_rows("grades", user_id),
+                detect_honors=False,
+                log_skipped=False,
+            )
             gpa = self.gpa_calculator.calculate_student_gpa(user_id, course_grades)
             
         # Call minimalist prep to get metrics
@@ -754,19 +1222,16 @@ def main():
 
     # Initialize GPA calculator
     print("🧮 Initializing GPA calculator...")
-    course_weights = {}
-    for _, row in generator.data_processor.gpa_weight_index.iterrows():
-        course_weights[row["course_code"]] = type(
-            "CourseWeight",
-            (),
-            {
-                "credit": row["credit"],
-                "weight": row["weight"],
-                "core": row["CORE"] == "Yes",
-                "is_ap": row["weight"] >= 1.0,
-                "is_honors": row["weight"] == 0.5,
-            },
-        )()
+    course_weights = {
+        row.course_code: WeightInfo(
+            credit=row.credit,
+            weight=row.weight,
+            core=row.CORE == "Yes",
+            is_ap=row.weight >= 1.0,
+            is_honors=row.weight == 0.5,
+        )
+        for row in generator.data_processor.gpa_weight_index.itertuples(index=False)
+    }
 
     generator.gpa_calculator = GPACalculator(course_weights)
 
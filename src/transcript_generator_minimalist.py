@@ -7,9 +7,14 @@ Enhanced Transcript Generator V3 with Awards and Decile Rankings
 """
 
 import logging
+import math
+import re
+from bisect import bisect_right
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 from datetime import datetime
+import numpy as np
 import pandas as pd
 import base64
 
@@ -20,9 +25,31 @@ from decile_rank_calculator import (
     DecileRankResult,
     get_student_decile_rank,
 )
+from data_models import WeightInfo
 
 logger = logging.getLogger(__name__)
 
+
+# Weight info for courses missing from the weight index. Unlike the generator's
+# default these count a full credit. Immutable, so one instance is shared by
+# every unindexed course
+_DEFAULT_WEIGHT = WeightInfo(credit=1.0)
+
+
+class HonorsWeightOverlay:
+    """Weight info of a course forced to Honors, wrapping its original weight"""
+
+    __slots__ = ("original", "weight", "is_honors", "is_ap", "core", "credit")
+
+    def __init__(self, original, new_weight):
+        self.original = original
+        self.weight = new_weight
+        self.is_honors = True
+        self.is_ap = getattr(original, "is_ap", False)
+        self.core = getattr(original, "core", False)
+        self.credit = getattr(original, "credit", 1.0)
+
+
 # === DUAL ENROLLMENT COURSE CODE MAPPINGS ===
 DE_COURSE_CODES = {
     "Composition 1": "ENC1101",
@@ -40,6 +67,18 @@ DE_COURSE_CODES = {
     "Intro to Literature": "LIT1000",
     "Introduction to Literature": "LIT1000",
 }
+# (lowercased title fragment, code) in DE_COURSE_CODES priority order
+_DE_COURSE_CODES_LOWER = tuple(
+    (key.lower(), value) for key, value in DE_COURSE_CODES.items()
+)
+# Look for pattern: 3-4 letters followed by space and numbers
+_DE_CODE_IN_TITLE_RE = re.compile(r"([A-Z]{3,4}\s*\d{4}[A-Z]?)")
+
+
+# Keswick numeric scale, straight letters: a grade >= THRESHOLDS[i] earns
+# LETTERS[i + 1]
+_LETTER_GRADE_THRESHOLDS = (60, 70, 80, 90)
+_LETTER_GRADES = ("F", "D", "C", "B", "A")
 
 
 def numeric_to_letter_grade(numeric_grade: float) -> str:
@@ -48,59 +87,85 @@ def numeric_to_letter_grade(numeric_grade: float) -> str:
     Uses Keswick Christian School's grading scale.
     Returns straight letters only (no plus/minus).
     """
-    if numeric_grade >= 90:
-        return "A"
-    elif numeric_grade >= 80:
-        return "B"
-    elif numeric_grade >= 70:
-        return "C"
-    elif numeric_grade >= 60:
-        return "D"
-    else:
+    # NaN never meets a cutoff
+    if math.isnan(numeric_grade):
         return "F"
+    return _LETTER_GRADES[bisect_right(_LETTER_GRADE_THRESHOLDS, numeric_grade)]
+
+
+@lru_cache(maxsize=1024, typed=True)
+def transcript_letter_grade(raw_grade: Any) -> str:
+    """
+    Grade as shown on the transcript: numeric percentages become letters.
+
+    Handles cases where grades come in as "90", "85", etc.; anything else is
+    returned as its stripped text. Memoized - the same few grade values repeat
+    across every row (typed, so 1 and 1.0 keep their own text).
+    """
+    grade = str(raw_grade).strip()
+    if grade.replace(".", "", 1).isdigit():
+        try:
+            value = float(grade)
+        except ValueError:
+            return grade
+        # Heuristic: GPA points are <= 5. Grades like 90/85 are percentages.
+        if value > 5.0:
+            return numeric_to_letter_grade(value)
+    return grade
+
+
+# Lower-cased course titles, shared across rows and students (the same few
+# hundred titles repeat for every transcript)
+_lower_title = lru_cache(maxsize=4096)(str.lower)
+
+# Honors/AP/DE text stripped from course titles, applied in this order (order
+# matters - longer strings first)
+_TITLE_REPLACEMENTS = (
+    "Dual Enrollment ",
+    "dual enrollment ",
+    "DUAL ENROLLMENT ",
+    " Dual Enrollment",
+    " dual enrollment",
+    " DUAL ENROLLMENT",
+    " (H)",
+    "(H)",
+    " (Honors)",
+    "(Honors)",
+    " (AP)",
+    "(AP)",
+    "AP ",
+    "Honors ",
+    "honors ",
+    "H ",
+    "DE ",
+    " - Honors",
+    " - AP",
+    " Honors",
+    " AP",
+    " - H",
+)
+_PRE_AP_RE = re.compile(r"Pre-AP", re.IGNORECASE)
 
 
+@lru_cache(maxsize=1024)
 def clean_course_title(
     title: str, is_ap: bool = False, is_honors: bool = False, is_de: bool = False
 ) -> str:
-    """Remove redundant honors/AP/DE text from course titles but preserve Pre-AP"""
+    """
+    Remove redundant honors/AP/DE text from course titles but preserve Pre-AP
+
+    Memoized: the same few hundred titles recur on every transcript in a batch.
+    """
     cleaned = title
 
     # IMPORTANT: Preserve "Pre-AP" by temporarily replacing it
     pre_ap_marker = "___PREAP___"
     if "Pre-AP" in cleaned or "pre-ap" in cleaned.lower():
         # Preserve Pre-AP by marking it
-        import re
-
-        cleaned = re.sub(r"Pre-AP", pre_ap_marker, cleaned, flags=re.IGNORECASE)
-
-    # Remove various forms of honors/AP/DE text (order matters - longer strings first)
-    replacements = [
-        "Dual Enrollment ",
-        "dual enrollment ",
-        "DUAL ENROLLMENT ",
-        " Dual Enrollment",
-        " dual enrollment",
-        " DUAL ENROLLMENT",
-        " (H)",
-        "(H)",
-        " (Honors)",
-        "(Honors)",
-        " (AP)",
-        "(AP)",
-        "AP ",
-        "Honors ",
-        "honors ",
-        "H ",
-        "DE ",
-        " - Honors",
-        " - AP",
-        " Honors",
-        " AP",
-        " - H",
-    ]
+        cleaned = _PRE_AP_RE.sub(pre_ap_marker, cleaned)
 
-    for rep in replacements:
+    # Remove various forms of honors/AP/DE text
+    for rep in _TITLE_REPLACEMENTS:
         cleaned = cleaned.replace(rep, "")
 
     # Restore Pre-AP
@@ -112,6 +177,7 @@ def clean_course_title(
     return cleaned.strip()
 
 
+@lru_cache(maxsize=256)
 def clean_sport_name(sport_name: str, season: str = "") -> str:
     """
     Clean sport name for transcript display.
@@ -128,14 +194,15 @@ def clean_sport_name(sport_name: str, season: str = "") -> str:
     Returns:
         Cleaned format like "Varsity Swimming" or "Junior Varsity Track & Field"
     """
-    # Handle "Sport - Level" format
-    parts = [p.strip() for p in sport_name.split("-")]
-    sport_base = parts[0]
+    # Handle "Sport - Level" format (the level is the segment after the
+    # first dash)
+    sport_base, has_level, rest = sport_name.partition("-")
+    sport_base = sport_base.strip()
     level = ""
 
-    if len(parts) > 1:
-        level_part = parts[1].lower()
-        if "varsity" in level_part and "jv" not in level_part.lower():
+    if has_level:
+        level_part = rest.split("-", 1)[0].lower()
+        if "varsity" in level_part and "jv" not in level_part:
             level = "Varsity"
         elif "jv" in level_part or "junior varsity" in level_part:
             level = "Junior Varsity"
@@ -146,6 +213,7 @@ def clean_sport_name(sport_name: str, season: str = "") -> str:
     return base_result
 
 
+@lru_cache(maxsize=64)
 def get_season_sort_order(season: str) -> int:
     """
     Return sort order for seasons: Fall=1, Winter=2, Spring=3, other=4
@@ -161,6 +229,43 @@ def get_season_sort_order(season: str) -> int:
         return 4  # Unknown seasons go last
 
 
+# Subject identification keywords for diploma designation (matched against
+# lowercased course titles)
+SUBJECT_KEYWORDS = {
+    "english": [
+        "english",
+        "composition",
+        "literature",
+        "enc1101",
+        "enc1102",
+        "lit1000",
+    ],
+    "history": ["history", "government", "civics", "amh1010", "amh1020"],
+    "math": [
+        "math",
+        "algebra",
+        "geometry",
+        "calculus",
+        "statistics",
+        "trigonometry",
+    ],
+    "science": [
+        "biology",
+        "chemistry",
+        "physics",
+        "science",
+        "anatomy",
+        "environmental",
+    ],
+}
+# One alternation per subject: a single search replaces a substring test
+# per keyword
+_SUBJECT_PATTERNS = {
+    subject: re.compile("|".join(map(re.escape, keywords)))
+    for subject, keywords in SUBJECT_KEYWORDS.items()
+}
+
+
 def calculate_diploma_designation(
     courses_by_grade: Dict, current_grade: int, grad_year: int
 ) -> str:
@@ -180,8 +285,6 @@ def calculate_diploma_designation(
     - Junior (11th): look at 9th + 10th + 11th
     - Senior (12th): look at all 4 years (final designation)
     """
-    from datetime import datetime
-
     # Determine which grades to analyze based on current grade
     if current_grade == 9:
         grades_to_analyze = ["9"]
@@ -199,35 +302,6 @@ def calculate_diploma_designation(
     # Count years with Honors+ (3.5+ GPA) in each subject area
     subject_honors_years = {"english": 0, "history": 0, "math": 0, "science": 0}
 
-    # Subject identification keywords
-    subject_keywords = {
-        "english": [
-            "english",
-            "composition",
-            "literature",
-            "enc1101",
-            "enc1102",
-            "lit1000",
-        ],
-        "history": ["history", "government", "civics", "amh1010", "amh1020"],
-        "math": [
-            "math",
-            "algebra",
-            "geometry",
-            "calculus",
-            "statistics",
-            "trigonometry",
-        ],
-        "science": [
-            "biology",
-            "chemistry",
-            "physics",
-            "science",
-            "anatomy",
-            "environmental",
-        ],
-    }
-
     # Analyze each grade year
     for grade_key in grades_to_analyze:
         if grade_key not in courses_by_grade:
@@ -241,7 +315,7 @@ def calculate_diploma_designation(
             if course.get("is_divider", False) or not course.get("is_core", False):
                 continue
 
-            course_title = course.get("course_title", "").lower()
+            course_title = _lower_title(course.get("course_title", ""))
             weight = course.get("weight")
 
             # Check if Honors+ (weight >= 0.5 indicates Honors or AP)
@@ -255,8 +329,8 @@ def calculate_diploma_designation(
                 continue
 
             # Identify subject and mark as Honors+ for this year
-            for subject, keywords in subject_keywords.items():
-                if any(keyword in course_title for keyword in keywords):
+            for subject, pattern in _SUBJECT_PATTERNS.items():
+                if pattern.search(course_title):
                     year_honors[subject] = True
                     break
 
@@ -290,21 +364,20 @@ def calculate_diploma_designation(
     return designation
 
 
+@lru_cache(maxsize=512)
 def get_de_course_code(course_title: str, semester: int = 1) -> Optional[str]:
-    """Get dual enrollment course code for display"""
+    """Get dual enrollment course code for display (memoized per title/semester)"""
 
     # First check if the course title already contains a course code
     # Format: "ASL 1140C--ASL 1" or "CLP 2140--Abnormal Psychology"
-    import re
-
-    # Look for pattern: 3-4 letters followed by space and numbers
-    match = re.match(r"([A-Z]{3,4}\s*\d{4}[A-Z]?)", course_title)
+    match = _DE_CODE_IN_TITLE_RE.match(course_title)
     if match:
         return match.group(1).replace(" ", "")
 
-    # Otherwise check the mapping dictionary
-    for key, value in DE_COURSE_CODES.items():
-        if key.lower() in course_title.lower():
+    # Otherwise check the mapping dictionary (first matching key wins)
+    course_title_lower = course_title.lower()
+    for key_lower, value in _DE_COURSE_CODES_LOWER:
+        if key_lower in course_title_lower:
             if isinstance(value, tuple):
                 return value[semester - 1]  # semester 1 or 2
             return value
@@ -312,51 +385,70 @@ def get_de_course_code(course_title: str, semester: int = 1) -> Optional[str]:
     return None
 
 
-def calculate_ytd_gpa_for_courses(courses: List[Dict], gpa_calculator) -> float:
-    """Calculate YTD weighted GPA for a specific year's courses (CORE only)"""
-    if not courses:
-        return 0.0
+def _ordered_sum(values: np.ndarray) -> float:
+    """Sum in element order, matching a Python += loop bit for bit"""
+    return float(np.cumsum(values)[-1]) if len(values) else 0.0
 
-    total_points = 0.0
-    total_credits = 0.0
-    core_courses_counted = 0
 
+def _core_semester_points(
+    courses: List[Dict], gpa_calculator
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Base points, weights and half-credits of every graded CORE semester
+
+    Each distinct grade is converted once; semesters whose grade has no GPA
+    value are dropped.
+
+    Returns:
+        (base_points, weights, half_credits) float64 arrays, one entry per
+        graded semester in course order (sem1 before sem2)
+    """
+    grades = []
+    credits = []
+    weights = []
     for course in courses:
         # CRITICAL FIX: Only count CORE courses in term GPA
         if not course.get("is_core", False):
             continue
 
-        sem1_grade = course.get("sem1_grade")
-        sem2_grade = course.get("sem2_grade")
         weight_obj = course.get("weight")
-
         if not weight_obj:
             continue
 
-        credit = getattr(weight_obj, "credit", 0.0)
-        weight = getattr(weight_obj, "weight", 0.0)
-
-        course_title = course.get("course_title", "Unknown")
-
-        for grade in [sem1_grade, sem2_grade]:
+        for grade in (course.get("sem1_grade"), course.get("sem2_grade")):
             if grade and grade != "—":
                 # Handle case where grade might be float instead of string
                 if isinstance(grade, (int, float)):
                     grade = str(grade)
-                base_points = gpa_calculator._grade_to_points(grade)
-                if base_points is not None:
-                    weighted_points = base_points + weight
-                    total_points += weighted_points * (credit / 2)
-                    total_credits += credit / 2
-                    core_courses_counted += 1
-                    logger.debug(
-                        f"    {course_title}: Grade={grade}, "
-                        f"Base={base_points}, Weight={weight}, "
-                        f"W_Pts={weighted_points}, Credit={credit/2}"
-                    )
+                grades.append(grade)
+                credits.append(getattr(weight_obj, "credit", 0.0))
+                weights.append(getattr(weight_obj, "weight", 0.0))
+
+    points_by_grade = {
+        grade: gpa_calculator._grade_to_points(grade) for grade in set(grades)
+    }
+    # None (non-GPA grade) becomes NaN and is masked out
+    base_points = np.array([points_by_grade[grade] for grade in grades], dtype=float)
+    graded = ~np.isnan(base_points)
+
+    return (
+        base_points[graded],
+        np.array(weights, dtype=float)[graded],
+        np.array(credits, dtype=float)[graded] / 2,
+    )
+
+
+def calculate_ytd_gpa_for_courses(courses: List[Dict], gpa_calculator) -> float:
+    """Calculate YTD weighted GPA for a specific year's courses (CORE only)"""
+    if not courses:
+        return 0.0
+
+    base_points, weights, half_credits = _core_semester_points(courses, gpa_calculator)
+    total_points = _ordered_sum((base_points + weights) * half_credits)
+    total_credits = _ordered_sum(half_credits)
 
     logger.debug(
-        f"  Year GPA: {core_courses_counted} core grades, "
+        f"  Year GPA: {len(base_points)} core grades, "
         f"{total_credits:.1f} credits, "
         f"GPA={total_points/total_credits if total_credits > 0 else 0:.3f}"
     )
@@ -370,33 +462,10 @@ def calculate_ytd_gpa_for_courses_unweighted(
     if not courses:
         return 0.0
 
-    total_points = 0.0
-    total_credits = 0.0
-
-    for course in courses:
-        # Only CORE courses
-        if not course.get("is_core", False):
-            continue
-
-        sem1_grade = course.get("sem1_grade")
-        sem2_grade = course.get("sem2_grade")
-        weight_obj = course.get("weight")
-
-        if not weight_obj:
-            continue
-
-        credit = getattr(weight_obj, "credit", 0.0)
-
-        for grade in [sem1_grade, sem2_grade]:
-            if grade and grade != "—":
-                # Handle case where grade might be float instead of string
-                if isinstance(grade, (int, float)):
-                    grade = str(grade)
-                base_points = gpa_calculator._grade_to_points(grade)
-                if base_points is not None:
-                    # No weight added for unweighted
-                    total_points += base_points * (credit / 2)
-                    total_credits += credit / 2
+    # No weight added for unweighted
+    base_points, _, half_credits = _core_semester_points(courses, gpa_calculator)
+    total_points = _ordered_sum(base_points * half_credits)
+    total_credits = _ordered_sum(half_credits)
 
     return (total_points / total_credits) if total_credits > 0 else 0.0
 
@@ -470,7 +539,7 @@ def check_semester_principals_list(
         return False
 
     # Check if all A's (in ALL courses)
-    all_as = all(c.get(sem_field, "") in ["A", "A+"] for c in actual_courses)
+    all_as = all(c[sem_field] in ("A", "A+") for c in actual_courses)
     if all_as:
         logger.debug(f"All A's in semester {semester} - QUALIFIES")
         return True
@@ -481,35 +550,36 @@ def check_semester_principals_list(
         logger.debug(f"No core courses for semester {semester}")
         return False
 
-    total_points = 0.0
-    total_credits = 0.0
-
-    for course in core_courses:
-        grade = course.get(sem_field, "")
-        if not grade or grade == "—":
-            continue
-
-        weight_obj = course.get("weight")
-        if not weight_obj:
-            continue
-
-        # Calculate weighted GPA points for this grade
-        base_points = gpa_calculator._grade_to_points(grade)
-        if base_points is None:
-            continue
-
-        weight = getattr(weight_obj, "weight", 0.0)
-        weighted_points = base_points + weight
-
-        # 0.5 credits per semester
-        total_points += weighted_points * 0.5
-        total_credits += 0.5
-
-        logger.debug(
-            f"  Course: {course.get('title', 'Unknown')}, "
-            f"Grade: {grade}, Base: {base_points}, Weight: {weight}, "
-            f"Weighted: {weighted_points}"
-        )
+    # One pass to collect grade/weight pairs, then a masked array reduction
+    graded_courses = [
+        course for course in core_courses if course.get(sem_field, "") != "—"
+    ]
+    grades = [course[sem_field] for course in graded_courses]
+    points_by_grade = {
+        grade: gpa_calculator._grade_to_points(grade) for grade in set(grades)
+    }
+    # None (non-GPA grade) becomes NaN and is masked out
+    base_points = np.array([points_by_grade[grade] for grade in grades], dtype=float)
+    weights = np.array(
+        [getattr(course["weight"], "weight", 0.0) for course in graded_courses],
+        dtype=float,
+    )
+    counted = ~np.isnan(base_points)
+
+    # 0.5 credits per semester
+    total_points = _ordered_sum((base_points + weights)[counted] * 0.5)
+    total_credits = 0.5 * int(counted.sum())
+
+    if logger.isEnabledFor(logging.DEBUG):
+        for course, grade, base, weight in zip(
+            graded_courses, grades, base_points, weights
+        ):
+            if not np.isnan(base):
+                logger.debug(
+                    f"  Course: {course.get('title', 'Unknown')}, "
+                    f"Grade: {grade}, Base: {base}, Weight: {weight}, "
+                    f"Weighted: {base + weight}"
+                )
 
     core_gpa = (total_points / total_credits) if total_credits > 0 else 0.0
     qualifies = core_gpa > 4.4
@@ -523,6 +593,158 @@ def check_semester_principals_list(
     return qualifies
 
 
+# HS-level subjects that earn credit when taken in middle school (matched
+# against lowercased titles)
+_MS_HS_KEYWORDS = (
+    "algebra",
+    "alg ",
+    "alg.",
+    "geometry",
+    "geo ",
+    "physical science",
+    "spanish",
+    "french",
+    "latin",
+    "biology",
+    "bio ",
+    "chemistry",
+    "chem ",
+    "physics",
+    "pre-calculus",
+    "calculus",
+)
+# Middle school math/science taken early counts as Honors
+_MS_HONORS_KEYWORDS = (
+    "algebra",
+    "alg ",  # Catch "Alg 1"
+    "alg.",  # Catch "Alg. 1"
+    "geometry",
+    "biology",
+    "chemistry",
+    "physics",
+    "physical science",
+    "pre-calculus",
+    "calculus",
+)
+# College course-code prefixes that mark a transfer course as DE
+_DE_COURSE_PREFIXES = (
+    "ENC",
+    "AMH",
+    "PSY",
+    "ASL",
+    "CLP",
+    "MAC",
+    "CHM",
+    "PHY",
+    "BIO",
+    "SPN",
+    "FRE",
+    "LIT",
+    "HUM",
+    "PHI",
+)
+# One alternation per keyword group: a single scan answers "any keyword in
+# title"
+_MS_HS_KEYWORD_RE = re.compile("|".join(map(re.escape, _MS_HS_KEYWORDS)))
+_MS_HONORS_KEYWORD_RE = re.compile("|".join(map(re.escape, _MS_HONORS_KEYWORDS)))
+_DE_COURSE_PREFIX_RE = re.compile("|".join(_DE_COURSE_PREFIXES))
+
+
+@lru_cache(maxsize=1024)
+def _is_transfer_de_course(course_title: str) -> bool:
+    """
+    Whether a transfer course title marks dual enrollment
+
+    Checks for "dual enrollment", "DE " or a college course-code prefix.
+    Memoized per title.
+    """
+    return (
+        "dual enrollment" in _lower_title(course_title)
+        or "DE " in course_title
+        or _DE_COURSE_PREFIX_RE.search(course_title) is not None
+    )
+
+
+# AP exams worth 6 college credits for scores of 4-5 (3 credits for a 3)
+_SIX_CREDIT_AP_RE = re.compile(
+    "|".join(
+        re.escape(name)
+        for name in (
+            "US History",
+            "U.S. History",
+            "United States History",
+            "European History",
+            "English Language",
+            "English Lit",
+        )
+    )
+)
+# Credits per qualifying AP score (3-5) by exam category
+_AP_CREDITS_BY_SCORE = {
+    "six_credit": {3: 3, 4: 6, 5: 6},
+    "biology": {3: 3, 4: 4, 5: 8},
+    "standard": {3: 3, 4: 3, 5: 3},
+}
+
+
+# Digits of an ordinal grade level such as "11th Grade"
+_GRADE_LEVEL_RE = re.compile(r"\d+")
+_ORDINAL_SUFFIXES = ("th", "st", "nd", "rd")
+# Ordinal suffix for a grade number ("1st", "2nd", "3rd"); anything else is "th"
+_GRADE_SUFFIX_MAP = {1: "st", 2: "nd", 3: "rd"}
+
+
+def _course_sort_key(course: Dict[str, Any]) -> Tuple[int, int, str]:
+    """
+    Transcript ordering key: CORE first, then AP -> DE -> Honors -> Regular
+
+    Returns:
+        (core_priority, -level, course_title) tuple
+    """
+    is_core = course.get("is_core", False)
+    weight = course.get("weight")
+
+    # Determine level (4=AP, 3=DE, 2=Honors, 1=Regular)
+    if getattr(weight, "is_ap", False):
+        level = 4
+    elif course.get("is_de", False):
+        level = 3
+    elif getattr(weight, "is_honors", False) or course.get("is_honors_detected", False):
+        level = 2
+    else:
+        level = 1
+
+    # CORE courses first (0), then non-CORE (1)
+    core_priority = 0 if is_core else 1
+
+    # Sort: (CORE status, -level, course_title)
+    # Negative level to get descending order (AP first, Regular last)
+    return (core_priority, -level, course.get("course_title", ""))
+
+
+# Four-digit years inside a free-form school year label
+_YEAR_RE = re.compile(r"\d{4}")
+
+
+@lru_cache(maxsize=64)
+def _school_year_end_lenient(school_year: str) -> Optional[int]:
+    """
+    End year of a school year label such as "2023 - 2024"
+
+    More forgiving than transcript_generator._school_year_end: labels that
+    aren't a single "YYYY-YYYY" pair fall back to their last four-digit year.
+    Memoized: a transcript only spans a handful of distinct school years.
+
+    Returns:
+        The ending year, or None if the label contains no year
+    """
+    year_parts = school_year.replace(" ", "").split("-")
+    if len(year_parts) == 2:
+        return int(year_parts[1])
+    years = _YEAR_RE.findall(school_year)
+    return int(years[-1]) if years else None
+
+
 def prepare_minimalist_template_data(
     student_record: Dict[str, Any],
     gpa: Any,
@@ -544,25 +766,18 @@ def prepare_minimalist_template_data(
 
     # Parse grade level (could be "11th Grade" or just "11")
     grade_level_str = str(student_record.get("Student grade level", "12"))
-    if (
-        "th" in grade_level_str
-        or "st" in grade_level_str
-        or "nd" in grade_level_str
-        or "rd" in grade_level_str
-    ):
-        import re
-
-        match = re.search(r"(\d+)", grade_level_str)
-        current_grade = int(match.group(1)) if match else 12
+    if grade_level_str.isdigit():
+        current_grade = int(grade_level_str)
+    elif any(suffix in grade_level_str for suffix in _ORDINAL_SUFFIXES):
+        match = _GRADE_LEVEL_RE.search(grade_level_str)
+        current_grade = int(match.group()) if match else 12
     else:
-        current_grade = int(grade_level_str) if grade_level_str.isdigit() else 12
+        current_grade = 12
 
     current_year = datetime.now().year
 
     # Add formatted current grade level to student record
-    grade_suffix = {1: "st", 2: "nd", 3: "rd"}.get(
-        current_grade if current_grade <= 3 else 0, "th"
-    )
+    grade_suffix = _GRADE_SUFFIX_MAP.get(current_grade, "th")
     student_record["current_grade_level"] = f"{current_grade}{grade_suffix} Grade"
 
     logger.info(
@@ -575,48 +790,48 @@ def prepare_minimalist_template_data(
         data_processor.grades["User ID"] == student_id
     ]
     
-    student_transfer_grades = data_processor.transfer_grades[
-        data_processor.transfer_grades["User ID"].astype(str) == str(student_id)
-    ]
+    student_transfer_grades = data_processor.get_transfer_grades_for_student(student_id)
     
-    # Mark transfer rows for distinct processing in main loop
+    # Mark transfer rows for distinct processing in main loop. The grades
+    # loader fills "Is Honors Detected" for every school row; transfer rows
+    # get False so the merged column stays a clean bool (no NaN)
     if not student_transfer_grades.empty:
-        student_transfer_grades = student_transfer_grades.copy()
-        student_transfer_grades["is_transfer_row"] = True
+        student_transfer_grades = student_transfer_grades.assign(
+            is_transfer_row=True, **{"Is Honors Detected": False}
+        )
     
     # Merge them
     student_grades_df = pd.concat([student_school_grades, student_transfer_grades], ignore_index=True)
 
 
     # === CALCULATE CLASS RANK ===
-    # Get all students in the same graduation year
-    same_grad_students = data_processor.student_details[
-        data_processor.student_details["Graduation year"] == grad_year
-    ]
-
-    # Get GPA data from pre-calculated results (only full-time students)
-    student_gpa_data = []
-    for _, peer in same_grad_students.iterrows():
-        peer_id = peer["User ID"]
-
-        # Get pre-calculated GPA (only exists for full-time students)
-        peer_gpa_record = data_processor.gpa_results.get(peer_id)
-        if peer_gpa_record:
-            # Get course count for this student
-            peer_grades = data_processor.grades[
-                data_processor.grades["User ID"] == peer_id
-            ]
-            unique_courses = peer_grades["Course Code"].nunique()
+    # Rankings depend only on the graduation year, so they are computed once
+    # per class and reused for every classmate
+    decile_rankings = data_processor.decile_rankings_by_grad_year.get(grad_year)
+    if decile_rankings is None:
+        # Get all students in the same graduation year
+        same_grad_students = data_processor.get_students_in_graduation_year(grad_year)
+
+        # Get GPA data from pre-calculated results (only full-time students)
+        student_gpa_data = []
+        for peer_id in same_grad_students["User ID"]:
+            # Get pre-calculated GPA (only exists for full-time students)
+            peer_gpa_record = data_processor.gpa_results.get(peer_id)
+            if peer_gpa_record:
+                # Course count for this student, counted once at load time
+                unique_courses = data_processor.course_counts_by_user.get(peer_id, 0)
+
+                core_weighted = peer_gpa_record.core_weighted_gpa
+                student_gpa_data.append((peer_id, core_weighted, unique_courses))
 
-            core_weighted = peer_gpa_record.core_weighted_gpa
-            student_gpa_data.append((peer_id, core_weighted, unique_courses))
+        logger.info(
+            f"Class rank data: {len(student_gpa_data)} students in grad year {grad_year}"
+        )
 
-    logger.info(
-        f"Class rank data: {len(student_gpa_data)} students in grad year {grad_year}"
-    )
+        # Calculate decile rankings
+        decile_rankings = calculate_decile_ranks(student_gpa_data, grad_year)
+        data_processor.decile_rankings_by_grad_year[grad_year] = decile_rankings
 
-    # Calculate decile rankings
-    decile_rankings = calculate_decile_ranks(student_gpa_data, grad_year)
     class_rank = get_student_decile_rank(student_id, decile_rankings)
 
     # Manual override for Grant Cook (4021011) - foreign language penalty
@@ -631,12 +846,15 @@ def prepare_minimalist_template_data(
             is_part_time=False,
         )
 
-    # === CALCULATE AWARDS ===
-    # Convert grades dataframe to list of dicts
+    # === CALCULATE AWARDS / ORGANIZE COURSES BY YEAR ===
+    # One pass over the grade rows (as plain dicts) builds both the awards
+    # input list and the school-year -> course map
     student_grades_list = []
-    for _, row in student_grades_df.iterrows():
-        course_code = str(row["Course Code"])
-        weight_info = gpa_calculator.course_weights_index.get(course_code)
+    year_course_map = {}
+    for row in student_grades_df.to_dict("records"):
+        school_year = row["School Year"]
+        raw_code = str(row["Course Code"])
+        code_weight = gpa_calculator.course_weights_index.get(raw_code)
 
         # Handle semester (Transfer grades may lack this column)
         raw_sem = row.get("Course part number")
@@ -646,17 +864,98 @@ def prepare_minimalist_template_data(
             semester = 1
 
         grade_dict = {
-            "school_year": row["School Year"],
+            "school_year": school_year,
             "semester": semester,
-            "course_code": course_code,
+            "course_code": raw_code,
             "course_title": row["Course Title"],
             "grade": row["Grade"],
-            "is_core": getattr(weight_info, "core", False) if weight_info else False,
-            "weight": getattr(weight_info, "weight", 0.0) if weight_info else 0.0,
-            "is_ap": getattr(weight_info, "is_ap", False) if weight_info else False,
+            "is_core": code_weight.core if code_weight else False,
+            "weight": code_weight.weight if code_weight else 0.0,
+            "is_ap": code_weight.is_ap if code_weight else False,
         }
         student_grades_list.append(grade_dict)
 
+        # Transfer rows only feed awards; their credits are placed separately.
+        # Explicit check - handle NaN/None
+        if row.get("is_transfer_row") == True:
+            continue
+
+        # Normalize course code (handle .0 suffixes from IDs/Pandas)
+        course_code = raw_code[:-2] if raw_code.endswith(".0") else raw_code
+
+        if school_year not in year_course_map:
+            year_course_map[school_year] = {}
+
+        if course_code not in year_course_map[school_year]:
+            weight_info = gpa_calculator.course_weights_index.get(course_code)
+            
+            # Detect honors from title logic (regex results, bool column)
+            is_honors_detected = bool(row.get("Is Honors Detected", False))
+            
+            if not weight_info:
+                weight_info = _DEFAULT_WEIGHT
+            
+            # FORCE HONORS IN WEIGHT IF DETECTED
+            if is_honors_detected and not weight_info.is_honors and not weight_info.is_ap:
+                # Create a modified clone of the weight info
+                # If it's a Pydantic model (CourseWeight), use copy approach
+                # If it's a dynamic object (W), create new one
+                old_weight = weight_info.weight
+                # If weight is standard/unweighted (e.g. 0.0 or 4.0 scale base?), add 0.5
+                # Assuming 0.0 in index means "standard". If it has a value, we add 0.5.
+                # Simplification: If it was 0.0, make it 0.5. If it was X, make it X+0.5?
+                # Actually, CourseWeight in data_models has weight. 
+                # Let's just set it to 0.5 as a safe default for "Honors" if it was 0.
+                if old_weight == 0.0: 
+                    new_val = 0.5 
+                else: 
+                    new_val = old_weight # If it already has weight, maybe keep it? Or add 0.5?
+                    # Safe bet: Honors usually 0.5.
+                
+                # We need an object that behaves like weight_info but with is_honors=True
+                weight_info = HonorsWeightOverlay(weight_info, new_val)
+
+            course_title = row["Course Title"]
+            course_title_lower = _lower_title(course_title)
+            # Detect DE courses
+            is_de = "dual enrollment" in course_title_lower or "DE " in course_title
+            de_code_sem1 = get_de_course_code(course_title, 1) if is_de else None
+            de_code_sem2 = get_de_course_code(course_title, 2) if is_de else None
+
+            # For Pre-AP courses, don't clean - "Pre-AP" is part of the official name
+            if "Pre-AP" in course_title or "pre-ap" in course_title_lower:
+                cleaned_title_keswick = course_title
+            else:
+                cleaned_title_keswick = clean_course_title(
+                    course_title,
+                    weight_info.is_ap,
+                    weight_info.is_honors or is_honors_detected,
+                    is_de,
+                )
+
+            year_course_map[school_year][course_code] = {
+                "course_code": course_code,
+                "course_title": course_title,
+                "cleaned_title": cleaned_title_keswick,
+                "school_year": school_year,
+                "sem1_grade": None,
+                "sem2_grade": None,
+                "weight": weight_info,
+                "is_core": weight_info.core,
+                "is_de": is_de,
+                "is_honors_detected": is_honors_detected,
+                "de_code_sem1": de_code_sem1,
+                "de_code_sem2": de_code_sem2,
+            }
+
+        # Clean grade: If numeric (e.g. transfer), convert to letter
+        final_grade = transcript_letter_grade(row["Grade"])
+
+        if semester == 1:
+            year_course_map[school_year][course_code]["sem1_grade"] = final_grade
+        elif semester == 2:
+            year_course_map[school_year][course_code]["sem2_grade"] = final_grade
+
     # === LOAD TEST SCORES (SAT SUPERSCORE) ===
     test_scores = {}
     sat_data = data_processor.get_sat_superscore_for_student(student_id)
@@ -686,39 +985,21 @@ def prepare_minimalist_template_data(
     #   6 credits (scores 4-5)
     # - Biology: 4 credits (score 4) or 8 credits (score 5)
     # - All other exams: 3 credits per exam (scores 3-5)
+    # (AP scores are validated to 1-5 when loaded)
     ap_college_credits = 0
     for exam in ap_scores:
         score = exam["score"]
-        subject = exam["subject"]
-
-        if score >= 3:  # Qualifying score
-            # Check for 6-credit exams
-            six_credit_exams = [
-                "US History",
-                "U.S. History",
-                "United States History",
-                "European History",
-                "English Language",
-                "English Lit",
-            ]
-            if any(x in subject for x in six_credit_exams):
-                if score >= 4:
-                    exam_credits = 6
-                else:
-                    exam_credits = 3  # Score of 3 gets standard 3 credits
-            # Check for Biology special case
-            elif "Biology" in subject:
-                if score == 5:
-                    exam_credits = 8
-                elif score == 4:
-                    exam_credits = 4
-                else:
-                    exam_credits = 3  # Score of 3 gets standard 3 credits
-            # All other exams
-            else:
-                exam_credits = 3
+        if score < 3:  # Not a qualifying score
+            continue
 
-            ap_college_credits += exam_credits
+        subject = exam["subject"]
+        if _SIX_CREDIT_AP_RE.search(subject):
+            category = "six_credit"
+        elif "Biology" in subject:
+            category = "biology"
+        else:
+            category = "standard"
+        ap_college_credits += _AP_CREDITS_BY_SCORE[category][score]
 
     # === LOAD SPORTS PARTICIPATION ===
     sports_list = data_processor.get_sports_for_student(
@@ -778,18 +1059,16 @@ def prepare_minimalist_template_data(
             logger.info(f"     Added sport: {clean_name} to year {year_normalized}")
 
     # Sort sports within each year by season (Fall, Winter, Spring)
-    for year in awards_by_year:
-        # Separate athletic awards from other awards
-        athletic_awards = [
-            a for a in awards_by_year[year] if a.award_type == "athletic"
-        ]
-        other_awards = [a for a in awards_by_year[year] if a.award_type != "athletic"]
-
-        # Sort athletic awards by season
-        athletic_awards.sort(key=lambda a: get_season_sort_order(a.semester or ""))
-
-        # Combine back: other awards first, then sorted athletic awards
-        awards_by_year[year] = other_awards + athletic_awards
+    # Other awards keep their order and come first, then athletic awards by
+    # season (list.sort is stable)
+    for year_awards in awards_by_year.values():
+        year_awards.sort(
+            key=lambda a: (
+                (1, get_season_sort_order(a.semester or ""))
+                if a.award_type == "athletic"
+                else (0, 0)
+            )
+        )
 
     logger.info(f"  📊 Total awards_by_year keys: {list(awards_by_year.keys())}")
 
@@ -820,167 +1099,17 @@ def prepare_minimalist_template_data(
     # Future: Check for Scholars, STEM Honors, Humanities Honors criteria
 
     # === ORGANIZE COURSES BY GRADE ===
-    year_course_map = {}
-
-    for _, row in student_grades_df.iterrows():
-        school_year = row["School Year"]
-        
-        # Normalize course code (handle .0 suffixes from IDs/Pandas)
-        raw_code = str(row["Course Code"])
-        if raw_code.endswith(".0"):
-            course_code = raw_code[:-2]
-        else:
-            course_code = raw_code
-
-        # Handle semester (Transfer grades may lack this column)
-        raw_sem = row.get("Course part number")
-        try:
-            semester = int(raw_sem) if pd.notna(raw_sem) else 1
-        except (ValueError, TypeError):
-            semester = 1
-
-        # Explicit check - handle NaN/None
-        is_transfer_row = row.get("is_transfer_row") == True
-        if not is_transfer_row:
-            if school_year not in year_course_map:
-                year_course_map[school_year] = {}
-
-            if course_code not in year_course_map[school_year]:
-                weight_info = gpa_calculator.course_weights_index.get(course_code)
-                
-                # Detect honors from title logic (regex results)
-                # Detect honors from title logic (regex results)
-                # Handle NaN/None safely - only True is True
-                val = row.get("Is Honors Detected")
-                is_honors_detected = True if val is True or val == 1.0 else False
-                
-                if not weight_info:
-                    weight_info = type(
-                        "W",
-                        (),
-                        {
-                            "credit": 1.0,
-                            "weight": 0.0,
-                            "is_ap": False,
-                            "is_honors": False,
-                            "core": False,
-                        },
-                    )()
-                
-                # FORCE HONORS IN WEIGHT IF DETECTED
-                if is_honors_detected and not getattr(weight_info, "is_honors", False) and not getattr(weight_info, "is_ap", False):
-                    # Create a modified clone of the weight info
-                    # If it's a Pydantic model (CourseWeight), use copy approach
-                    # If it's a dynamic object (W), create new one
-                    old_weight = getattr(weight_info, "weight", 0.0)
-                    # If weight is standard/unweighted (e.g. 0.0 or 4.0 scale base?), add 0.5
-                    # Assuming 0.0 in index means "standard". If it has a value, we add 0.5.
-                    # Simplification: If it was 0.0, make it 0.5. If it was X, make it X+0.5?
-                    # Actually, CourseWeight in data_models has weight. 
-                    # Let's just set it to 0.5 as a safe default for "Honors" if it was 0.
-                    if old_weight == 0.0: 
-                        new_val = 0.5 
-                    else: 
-                        new_val = old_weight # If it already has weight, maybe keep it? Or add 0.5?
-                        # Safe bet: Honors usually 0.5.
-                    
-                    # We need an object that behaves like weight_info but with is_honors=True
-                    # We can use a simple class
-                    class HonorsWeightOverlay:
-                        def __init__(self, original, new_weight):
-                            self.original = original
-                            self.weight = new_weight
-                            self.is_honors = True
-                            self.is_ap = getattr(original, "is_ap", False)
-                            self.core = getattr(original, "core", False)
-                            self.credit = getattr(original, "credit", 1.0)
-                            
-                    weight_info = HonorsWeightOverlay(weight_info, new_val)
-
-                course_title = row["Course Title"]
-                # Detect DE courses
-                is_de = "dual enrollment" in course_title.lower() or "DE " in course_title
-                de_code_sem1 = get_de_course_code(course_title, 1) if is_de else None
-                de_code_sem2 = get_de_course_code(course_title, 2) if is_de else None
-
-                # For Pre-AP courses, don't clean - "Pre-AP" is part of the official name
-                if "Pre-AP" in course_title or "pre-ap" in course_title.lower():
-                    cleaned_title_keswick = course_title
-                else:
-                    cleaned_title_keswick = clean_course_title(
-                        course_title,
-                        getattr(weight_info, "is_ap", False),
-                        getattr(weight_info, "is_honors", False) or is_honors_detected,
-                        is_de,
-                    )
-
-                year_course_map[school_year][course_code] = {
-                    "course_code": course_code,
-                    "course_title": course_title,
-                    "cleaned_title": cleaned_title_keswick,
-                    "school_year": school_year,
-                    "sem1_grade": None,
-                    "sem2_grade": None,
-                    "weight": weight_info,
-                    "is_core": getattr(weight_info, "core", False),
-                    "is_de": is_de,
-                    "is_honors_detected": is_honors_detected,
-                    "de_code_sem1": de_code_sem1,
-                    "de_code_sem2": de_code_sem2,
-                }
-
-
-            # Clean grade: If numeric (e.g. transfer), convert to letter
-            # This handles cases where transfer grades come in as "90", "85", etc.
-            raw_grade = str(row["Grade"]).strip()
-            final_grade = raw_grade
-            
-            if raw_grade.replace('.', '', 1).isdigit():
-                 try:
-                     val = float(raw_grade)
-                     if val > 5.0: # Heuristic: GPA points are <= 5. Grades like 90/85 are percentages.
-                          final_grade = numeric_to_letter_grade(val)
-                 except ValueError:
-                     pass
-
-            if semester == 1:
-                year_course_map[school_year][course_code]["sem1_grade"] = final_grade
-            elif semester == 2:
-                year_course_map[school_year][course_code]["sem2_grade"] = final_grade
+    # (year_course_map is built alongside student_grades_list above)
 
     # Map courses to grade levels
     courses_by_grade = {}
     middle_school_credits = []
     year_gpas = {}
 
-    ms_hs_keywords = [
-        "algebra",
-        "alg ",
-        "alg.",
-        "geometry",
-        "geo ",
-        "physical science",
-        "spanish",
-        "french",
-        "latin",
-        "biology",
-        "bio ",
-        "chemistry",
-        "chem ",
-        "physics",
-        "pre-calculus",
-        "calculus",
-    ]
-
     for school_year in sorted(year_course_map.keys()):
-        year_parts = school_year.replace(" ", "").split("-")
-        if len(year_parts) == 2:
-            end_year = int(year_parts[1])
-        else:
-            import re
-
-            years = re.findall(r"\d{4}", school_year)
-            end_year = int(years[-1]) if years else current_year
+        end_year = _school_year_end_lenient(school_year)
+        if end_year is None:
+            end_year = current_year
 
         grade_level = 12 - (grad_year - end_year)
         courses = list(year_course_map[school_year].values())
@@ -1007,48 +1136,27 @@ def prepare_minimalist_template_data(
             course["credits"] = earned_credit
 
         if grade_level < 9:
-            ms_honors_keywords = [
-                "algebra",
-                "alg ", # Catch "Alg 1"
-                "alg.", # Catch "Alg. 1"
-                "geometry",
-                "biology",
-                "chemistry",
-                "physics",
-                "physical science",
-                "pre-calculus",
-                "calculus"
-            ]
-            
             for course in courses:
-                course_lower = course["course_title"].lower()
-                if any(keyword in course_lower for keyword in ms_hs_keywords):
+                course_lower = _lower_title(course["course_title"])
+                if _MS_HS_KEYWORD_RE.search(course_lower):
                     # Format grade_level with ordinal suffix for display
-                    suffix_map = {1: "st", 2: "nd", 3: "rd"}
-                    suffix = suffix_map.get(grade_level, "th")
+                    suffix = _GRADE_SUFFIX_MAP.get(grade_level, "th")
                     course["grade_level"] = f"{grade_level}{suffix}"
                     
                     # MS HONORS OVERRIDE: Math/Science taken early is Honors
-                    has_honors_weight = getattr(weight_info, "is_honors", False)
-                    keyword_match = any(hk in course_lower for hk in ms_honors_keywords)
+                    course_weight = course["weight"]
+                    has_honors_weight = course_weight.is_honors
+                    keyword_match = (
+                        _MS_HONORS_KEYWORD_RE.search(course_lower) is not None
+                    )
                     
-                    if keyword_match and not has_honors_weight and not getattr(weight_info, "is_ap", False):
+                    if keyword_match and not has_honors_weight and not course_weight.is_ap:
 
                             # Force Honors Override
-                            # Define overlay class (copied from above loop to ensure scope availability)
-                            class HonorsWeightOverlay:
-                                def __init__(self, original, new_weight):
-                                    self.original = original
-                                    self.weight = new_weight
-                                    self.is_honors = True
-                                    self.is_ap = getattr(original, "is_ap", False)
-                                    self.core = getattr(original, "core", False)
-                                    self.credit = getattr(original, "credit", 1.0)
-                            
-                            old_weight = getattr(weight_info, "weight", 0.0)
+                            old_weight = course_weight.weight
                             new_val = 0.5 if old_weight == 0.0 else old_weight 
                             
-                            course["weight"] = HonorsWeightOverlay(weight_info, new_val)
+                            course["weight"] = HonorsWeightOverlay(course_weight, new_val)
                             course["is_honors_detected"] = True
                             has_honors_weight = True # Now it is honors
 
@@ -1083,35 +1191,40 @@ def prepare_minimalist_template_data(
     def consolidate_duplicate_courses(courses_list):
         consolidated = {}
         for course in courses_list:
-            # Determine if this row is a transfer row (from legacy format)
             # Use cleaned title as key for robust matching
-            key = course.get("cleaned_title", course["course_title"].strip())
-            
-            if key in consolidated:
-                existing = consolidated[key]
-                # Merge grades
-                if not existing.get("sem1_grade") and course.get("sem1_grade"):
-                    existing["sem1_grade"] = course["sem1_grade"]
-                    # If we merged a numeric grade, convert it if needed
-                    # logic handled in main loop but good to ensure
-                if not existing.get("sem2_grade") and course.get("sem2_grade"):
-                    existing["sem2_grade"] = course["sem2_grade"]
-                
-                # Merge credits
-                existing["credits"] = max(existing.get("credits", 0), course.get("credits", 0))
-                
-                # Merge checks
-                if course.get("is_honors_detected"): existing["is_honors_detected"] = True
-                
-                # Prefer the entry with valid weight info if current lacks it?
-                # Usually school entry has better weight info.
+            if "cleaned_title" in course:
+                key = course["cleaned_title"]
+            else:
+                key = course["course_title"].strip()
+
+            existing = consolidated.setdefault(key, course)
+            if existing is course:
+                continue
+
+            # Merge grades
+            sem1_grade = course.get("sem1_grade")
+            if sem1_grade and not existing.get("sem1_grade"):
+                existing["sem1_grade"] = sem1_grade
+            sem2_grade = course.get("sem2_grade")
+            if sem2_grade and not existing.get("sem2_grade"):
+                existing["sem2_grade"] = sem2_grade
+
+            # Merge credits
+            existing["credits"] = max(
+                existing.get("credits", 0), course.get("credits", 0)
+            )
+
+            # Merge checks
+            if course.get("is_honors_detected"):
+                existing["is_honors_detected"] = True
+
+            # Prefer the entry with valid weight info if current lacks it
+            # (usually the school entry has better weight info)
+            w_new = course.get("weight")
+            if w_new:
                 w_ex = existing.get("weight")
-                w_new = course.get("weight")
-                if w_new and (not w_ex or getattr(w_ex, "weight", 0) == 0):
+                if not w_ex or getattr(w_ex, "weight", 0) == 0:
                     existing["weight"] = w_new
-                    
-            else:
-                consolidated[key] = course
         return list(consolidated.values())
 
     # Sort courses by CORE status and level (AP → DE → Honors → Regular)
@@ -1119,29 +1232,7 @@ def prepare_minimalist_template_data(
         """Sort courses by CORE status and level priority
         Order: CORE (AP → DE → Honors → Regular), then Non-CORE (same order)
         """
-
-        def get_sort_key(course):
-            is_core = course.get("is_core", False)
-            weight = course.get("weight")
-
-            # Determine level (4=AP, 3=DE, 2=Honors, 1=Regular)
-            if getattr(weight, "is_ap", False):
-                level = 4
-            elif course.get("is_de", False):
-                level = 3
-            elif getattr(weight, "is_honors", False) or course.get("is_honors_detected", False):
-                level = 2
-            else:
-                level = 1
-
-            # CORE courses first (0), then non-CORE (1)
-            core_priority = 0 if is_core else 1
-
-            # Sort: (CORE status, -level, course_title)
-            # Negative level to get descending order (AP first, Regular last)
-            return (core_priority, -level, course.get("course_title", ""))
-
-        return sorted(courses_list, key=get_sort_key)
+        return sorted(courses_list, key=_course_sort_key)
 
     # Apply consolidation and sorting to all grade levels
     for grade_key in courses_by_grade:
@@ -1149,30 +1240,28 @@ def prepare_minimalist_template_data(
         courses_by_grade[grade_key] = consolidate_duplicate_courses(courses_by_grade[grade_key])
         # Then sort
         courses_by_grade[grade_key] = sort_courses_by_priority(courses_by_grade[grade_key])
-        
-        try:
-            # Recalculate gpa for the consolidated list??
-            # ytd_gpa functions use the list.
-            pass
-        except: pass
 
     middle_school_credits = consolidate_duplicate_courses(middle_school_credits)
     middle_school_credits = sort_courses_by_priority(middle_school_credits)
 
-
-    middle_school_credits = sort_courses_by_priority(middle_school_credits)
-
     # === INTEGRATE TRANSFER CREDITS INTO GRADE BLOCKS ===
     if hasattr(data_processor, "transfer_grades"):
-        student_transfers = data_processor.transfer_grades[
-            data_processor.transfer_grades["User ID"] == student_id
-        ]
+        # The same rows merged into the grade loop above, each marked with
+        # is_transfer_row
+        student_transfers = student_transfer_grades
 
         # Group transfers by grade -> school -> courses
         transfer_by_year_school = {}
         transfer_middle_school = []  # NEW: Track middle school transfer credits
 
-        for _, row in student_transfers.iterrows():
+        # Middle school transfer entries by course title (first entry wins), so
+        # semester consolidation below is a lookup instead of a list scan
+        ms_transfer_index = {}
+        for ms_course in middle_school_credits:
+            if ms_course.get("is_transfer"):
+                ms_transfer_index.setdefault(ms_course.get("course_title"), ms_course)
+
+        for row in student_transfers.to_dict("records"):
             school_year = row.get("School Year", "")
             source_school = row.get(
                 "Transfer School Name", row.get("Source School", "Transfer Institution")
@@ -1180,14 +1269,9 @@ def prepare_minimalist_template_data(
             course_title = row["Course Title"]
 
             # Calculate grade level for this transfer
-            year_parts = school_year.replace(" ", "").split("-")
-            if len(year_parts) == 2:
-                end_year = int(year_parts[1])
-            else:
-                import re
-
-                years = re.findall(r"\d{4}", school_year)
-                end_year = int(years[-1]) if years else current_year
+            end_year = _school_year_end_lenient(school_year)
+            if end_year is None:
+                end_year = current_year
 
             grade_level = 12 - (grad_year - end_year)
 
@@ -1240,7 +1324,7 @@ def prepare_minimalist_template_data(
                     #     )
                 # continue  # Skip to next transfer grade
 
-            if is_transfer_row:
+            if row.get("is_transfer_row") == True:
                 source_school = row.get("School Name", "Transfer")
                 if 9 <= grade_level <= 12:
                     grade_key = str(grade_level)
@@ -1260,43 +1344,11 @@ def prepare_minimalist_template_data(
                             str(row.get("Course Code", ""))
                         )
                         if not weight_info:
-                            weight_info = type(
-                                "W",
-                                (),
-                                {
-                                    "credit": 1.0,
-                                    "weight": 0.0,
-                                    "is_ap": False,
-                                    "is_honors": False,
-                                    "core": False,
-                                },
-                            )()
+                            weight_info = _DEFAULT_WEIGHT
 
                         # Detect DE in transfer courses
-                        # Check for: "dual enrollment", "DE ", or college course codes
-                        is_de = (
-                            "dual enrollment" in course_title.lower()
-                            or "DE " in course_title
-                            or any(
-                                prefix in course_title
-                                for prefix in [
-                                    "ENC",
-                                    "AMH",
-                                    "PSY",
-                                    "ASL",
-                                    "CLP",
-                                    "MAC",
-                                    "CHM",
-                                    "PHY",
-                                    "BIO",
-                                    "SPN",
-                                    "FRE",
-                                    "LIT",
-                                    "HUM",
-                                    "PHI",
-                                ]
-                            )
-                        )
+                        course_title_lower = _lower_title(course_title)
+                        is_de = _is_transfer_de_course(course_title)
                         de_code_sem1 = (
                             get_de_course_code(course_title, 1) if is_de else None
                         )
@@ -1305,13 +1357,13 @@ def prepare_minimalist_template_data(
                         )
 
                         # For Pre-AP courses, don't clean the title - "Pre-AP" is part of the official name
-                        if "Pre-AP" in course_title or "pre-ap" in course_title.lower():
+                        if "Pre-AP" in course_title or "pre-ap" in course_title_lower:
                             cleaned_title_to_use = course_title
                         else:
                             cleaned_title_to_use = clean_course_title(
                                 course_title,
-                                getattr(weight_info, "is_ap", False),
-                                getattr(weight_info, "is_honors", False),
+                                weight_info.is_ap,
+                                weight_info.is_honors,
                                 is_de,
                             )
 
@@ -1323,7 +1375,7 @@ def prepare_minimalist_template_data(
                             "sem1_grade": None,
                             "sem2_grade": None,
                             "weight": weight_info,
-                            "is_core": getattr(weight_info, "core", False),
+                            "is_core": weight_info.core,
                             "display_year": school_year,
                             "grade_level": grade_level,
                             "is_transfer": True,
@@ -1337,16 +1389,17 @@ def prepare_minimalist_template_data(
 
                     # Add semester grades (transfer grades don't have semester column, so count occurrences)
                     grade_value = row.get("Grade", "")
+                    grade_text = str(grade_value)
 
                     # Convert numerical grade to letter grade if it's a number
-                    if grade_value and str(grade_value).replace(".", "", 1).isdigit():
+                    if grade_value and grade_text.replace(".", "", 1).isdigit():
                         try:
                             numeric_grade = float(grade_value)
                             letter_grade = numeric_to_letter_grade(numeric_grade)
                         except (ValueError, TypeError):
-                            letter_grade = str(grade_value)
+                            letter_grade = grade_text
                     else:
-                        letter_grade = str(grade_value) if grade_value else ""
+                        letter_grade = grade_text if grade_value else ""
 
                     # F grade = 0 credits, otherwise use Credits Attempted or default 0.5
                     if letter_grade == "F":
@@ -1368,19 +1421,20 @@ def prepare_minimalist_template_data(
                     
                 elif grade_level < 9:
                     # Middle School Transfer - add to middle_school_credits
-                    course_lower = course_title.lower()
+                    course_lower = _lower_title(course_title)
                     
                     # Check if this is a HS-level course taken in MS (Algebra, Geometry, etc.)
-                    if any(keyword in course_lower for keyword in ms_hs_keywords):
+                    if _MS_HS_KEYWORD_RE.search(course_lower):
                         # Convert numeric grade to letter
                         raw_grade = row.get("Grade", "")
+                        raw_grade_text = str(raw_grade)
                         try:
-                            if str(raw_grade).replace(".", "", 1).isdigit():
+                            if raw_grade_text.replace(".", "", 1).isdigit():
                                 letter_grade = numeric_to_letter_grade(float(raw_grade))
                             else:
-                                letter_grade = str(raw_grade) if pd.notna(raw_grade) else ""
+                                letter_grade = raw_grade_text if pd.notna(raw_grade) else ""
                         except ValueError:
-                            letter_grade = str(raw_grade) if pd.notna(raw_grade) else ""
+                            letter_grade = raw_grade_text if pd.notna(raw_grade) else ""
                         
                         # Calculate credit
                         try:
@@ -1391,20 +1445,14 @@ def prepare_minimalist_template_data(
                         if letter_grade == "F":
                             credit = 0.0
                         
-                        # Define keywords locally (same as in school grades block)
-                        ms_honors_keywords_local = [
-                            "algebra", "alg ", "alg.", "geometry", "geo ", 
-                            "physical science", "spanish", "french", "latin",
-                            "biology", "bio ", "chemistry", "chem ", "physics",
-                            "pre-calculus", "calculus"
-                        ]
-                        
-                        # Check honors based on title keywords
-                        is_honors_detected = any(hk in course_lower for hk in ms_honors_keywords_local)
+                        # Check honors based on title keywords (the same HS-level
+                        # keyword list as above)
+                        is_honors_detected = (
+                            _MS_HS_KEYWORD_RE.search(course_lower) is not None
+                        )
                         
                         # Grade level suffix
-                        suffix_map = {1: "st", 2: "nd", 3: "rd"}
-                        suffix = suffix_map.get(grade_level, "th")
+                        suffix = _GRADE_SUFFIX_MAP.get(grade_level, "th")
                         
                         # Clean title
                         if "Pre-AP" in course_title or "pre-ap" in course_lower:
@@ -1413,9 +1461,7 @@ def prepare_minimalist_template_data(
                             cleaned_title = clean_course_title(course_title, False, is_honors_detected, False)
                         
                         # Check if course already exists (consolidate semesters)
-                        existing = next((c for c in middle_school_credits 
-                                        if c.get("course_title") == course_title 
-                                        and c.get("is_transfer")), None)
+                        existing = ms_transfer_index.get(course_title)
                         
                         if existing:
                             if not existing.get("sem2_grade"):
@@ -1423,15 +1469,14 @@ def prepare_minimalist_template_data(
                                 existing["credits"] = existing.get("credits", 0) + credit
                         else:
                             # Create dummy weight object for template compatibility
-                            weight_obj = type("W", (), {
-                                "credit": credit,
-                                "weight": 0.5 if is_honors_detected else 0.0,
-                                "is_ap": False,
-                                "is_honors": is_honors_detected,
-                                "core": True,
-                            })()
+                            weight_obj = WeightInfo(
+                                credit=credit,
+                                weight=0.5 if is_honors_detected else 0.0,
+                                is_honors=is_honors_detected,
+                                core=True,
+                            )
                             
-                            middle_school_credits.append({
+                            ms_transfer_index[course_title] = {
                                 "course_code": str(row.get("Course Code", "")),
                                 "course_title": course_title,
                                 "cleaned_title": cleaned_title,
@@ -1444,7 +1489,10 @@ def prepare_minimalist_template_data(
                                 "is_transfer": True,
                                 "weight": weight_obj,
                                 "source_school": source_school,
-                            })
+                            }
+                            middle_school_credits.append(
+                                ms_transfer_index[course_title]
+                            )
 
     # Integrate transfer courses into courses_by_grade with dividers
     for grade_key in transfer_by_year_school:
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+BATCH TRANSCRIPT TESTS - Batch runs keep student order and report every failure
+Transcript rendering is replaced by fakes, so no CSV exports or WeasyPrint needed
+
+COVERAGE:
+✅ Serial and process-pool batches return paths in user_ids order
+✅ Per-student failures are collected without stopping the batch
+✅ A worker that dies marks its students as errors, the rest still report
+✅ A process that ran the parallel GPA kernels can still fork a pool and exit
+✅ Threaded PDF writes finish out of order but report in user_ids order
+
+Priority: HIGH - Graduating-class runs must not drop or reorder students
+"""
+
+import multiprocessing
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+from io import BytesIO
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+import transcript_generator
+from transcript_generator import TranscriptGenerator
+
+USER_IDS = list(range(101, 131))
+
+requires_fork = pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(),
+    reason="workers only inherit the patched generator when forked",
+)
+
+
+def fake_generate_transcript(failing=(), dying=()):
+    """generate_transcript stand-in: a path per student, or a failure"""
+
+    def generate_transcript(
+        user_id, transcript_type="Official", output_filename=None, layout="landscape"
+    ):
+        if user_id in failing:
+            raise ValueError(f"no grades for {user_id}")
+        if user_id in dying:
+            os._exit(1)
+        return Path(f"{user_id}_{transcript_type}_{layout}.pdf")
+
+    return generate_transcript
+
+
+@pytest.fixture
+def generator(tmp_path):
+    return TranscriptGenerator(tmp_path)
+
+
+def expected_paths(user_ids, transcript_type="Official", layout="landscape"):
+    return [Path(f"{user_id}_{transcript_type}_{layout}.pdf") for user_id in user_ids]
+
+
+def test_serial_batch_keeps_order_and_skips_failures(generator):
+    """The default in-process run returns successes in input order"""
+    generator.generate_transcript = fake_generate_transcript(failing={105, 120})
+
+    files = generator.generate_batch_transcripts(user_ids=USER_IDS, layout="v5")
+
+    assert files == expected_paths(
+        [user_id for user_id in USER_IDS if user_id not in (105, 120)], layout="v5"
+    )
+    assert generator._batch_timestamp is None
+
+
+@requires_fork
+@pytest.mark.parametrize("max_workers", [2, 3, 8])
+def test_pool_batch_keeps_order(generator, max_workers):
+    """Chunks come back from the pool in user_ids order"""
+    generator.generate_transcript = fake_generate_transcript()
+
+    files = generator.generate_batch_transcripts(
+        user_ids=USER_IDS, transcript_type="Unofficial", max_workers=max_workers
+    )
+
+    assert files == expected_paths(USER_IDS, transcript_type="Unofficial")
+    assert transcript_generator._worker_generator is None
+
+
+@requires_fork
+def test_pool_batch_collects_student_errors(generator):
+    """A student that fails in a worker is an error; neighbours still generate"""
+    generator.generate_transcript = fake_generate_transcript(failing={103, 117})
+    generated_files, errors = [], []
+
+    generator._generate_batch_pool(
+        USER_IDS, "Official", "landscape", 3, generated_files, errors
+    )
+
+    assert generated_files == expected_paths(
+        [user_id for user_id in USER_IDS if user_id not in (103, 117)]
+    )
+    assert errors == [(103, "no grades for 103"), (117, "no grades for 117")]
+
+
+@requires_fork
+def test_pool_batch_survives_dead_worker(generator):
+    """Students lost with a dead worker are errors; nobody is dropped or doubled"""
+    generator.generate_transcript = fake_generate_transcript(dying={110})
+    generated_files, errors = [], []
+
+    generator._generate_batch_pool(
+        USER_IDS, "Official", "landscape", 2, generated_files, errors
+    )
+
+    failed = [user_id for user_id, _ in errors]
+    generated = [int(path.name.split("_")[0]) for path in generated_files]
+    assert 110 in failed
+    assert all(error.startswith("worker pool failed") for _, error in errors)
+    assert sorted(failed + generated) == USER_IDS
+    # Whatever did generate is still in user_ids order
+    assert generated == sorted(generated)
+    assert transcript_generator._worker_generator is None
+
+
+@requires_fork
+def test_pool_batch_after_parallel_gpa_kernel_exits(tmp_path):
+    """Forking after a parallel Numba kernel must not hang the parent at exit"""
+    script = f"""
+import sys
+from pathlib import Path
+sys.path.append({str(Path(__file__).parent.parent / "src")!r})
+
+import numpy as np
+from gpa_calculator import _gpa_batch_kernel
+from transcript_generator import TranscriptGenerator
+
+_gpa_batch_kernel(
+    np.array([0, 2, 3]), np.array([4.0, 3.0, 2.0]), np.zeros(3), np.ones(3),
+    np.ones(3, dtype=np.bool_),
+)
+generator = TranscriptGenerator(Path({str(tmp_path)!r}))
+generator.generate_transcript = lambda user_id, *args, **kw: Path(f"{{user_id}}.pdf")
+files = generator.generate_batch_transcripts(user_ids=[1, 2, 3, 4], max_workers=2)
+assert files == [Path(f"{{i}}.pdf") for i in [1, 2, 3, 4]], files
+"""
+
+    result = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, timeout=60
+    )
+
+    assert result.returncode == 0, result.stderr
+
+
+@pytest.fixture
+def threaded_generator(generator, monkeypatch):
+    """Generator whose PDF writes sleep a random while instead of running WeasyPrint"""
+    monkeypatch.setattr(transcript_generator, "WEASYPRINT_AVAILABLE", True)
+    rng = random.Random(0)
+    delays = {user_id: rng.uniform(0.0, 0.02) for user_id in USER_IDS}
+    generator.writer_threads = set()
+
+    def prepare_transcript(user_id, transcript_type, output_filename, layout):
+        if user_id == 108:
+            raise KeyError("student 108 not found")
+        return {"user_id": user_id}, Path(f"{user_id}_{transcript_type}_{layout}.pdf")
+
+    def render_html_stream(template_data, layout="landscape"):
+        return BytesIO(str(template_data["user_id"]).encode())
+
+    def generate_pdf(html_file, output_path, layout="landscape"):
+        generator.writer_threads.add(threading.get_ident())
+        user_id = int(html_file.getvalue())
+        time.sleep(delays[user_id])
+        if user_id == 121:
+            raise OSError("disk full")
+
+    generator._prepare_transcript = prepare_transcript
+    generator._render_html_stream = render_html_stream
+    generator._generate_pdf_weasyprint = generate_pdf
+    return generator
+
+
+@pytest.mark.parametrize("pdf_threads", [2, 4])
+def test_threaded_batch_keeps_order_and_collects_errors(
+    threaded_generator, pdf_threads
+):
+    """Render and write failures are errors; the rest report in input order"""
+    generated_files, errors = [], []
+
+    threaded_generator._generate_batch_threaded(
+        USER_IDS, "Official", "landscape", pdf_threads, generated_files, errors
+    )
+
+    assert generated_files == expected_paths(
+        [user_id for user_id in USER_IDS if user_id not in (108, 121)]
+    )
+    assert errors == [(108, "'student 108 not found'"), (121, "disk full")]
+    assert 1 < len(threaded_generator.writer_threads) <= pdf_threads
+
+
+def test_threaded_batch_only_when_requested(threaded_generator):
+    """pdf_threads > 1 opts into writer threads; the default writes inline"""
+    threaded_generator.generate_transcript = fake_generate_transcript()
+
+    files = threaded_generator.generate_batch_transcripts(user_ids=USER_IDS)
+
+    assert files == expected_paths(USER_IDS)
+    assert not threaded_generator.writer_threads
+
+    files = threaded_generator.generate_batch_transcripts(
+        user_ids=USER_IDS, pdf_threads=3
+    )
+
+    assert files == expected_paths(
+        [user_id for user_id in USER_IDS if user_id not in (108, 121)]
+    )
+    assert threaded_generator.writer_threads
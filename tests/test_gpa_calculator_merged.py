@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+MERGED GPA TESTS - Compiled GPA reductions agree with a plain pandas groupby
+Synthetic Merged_Grades.csv written to a temp dir, no exports needed
+
+COVERAGE:
+✅ _student_totals() / calculate_gpa() match per-student pandas sums
+✅ _roster_totals() / calculate_all_students() match the same sums for everyone
+✅ Junk credits/weights, blank and lower-case grades parse like the pandas path
+✅ calculate_all_students(backend="polars") matches the pandas backend
+
+Priority: HIGH - Cumulative GPAs on transcripts come from these kernels
+"""
+
+import random
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from gpa_calculator_merged import (
+    MergedGPACalculator,
+    _roster_totals,
+    _student_totals,
+)
+
+GRADES = ["A", "a-", "B+", "B", "c", "D", "F", "P", "W", "92", "78", "55", ""]
+CREDITS = ["1.0", "0.5", "0.25", "", "n/a"]
+WEIGHTS = ["0", "0.5", "1.0", "", "x"]
+
+
+def write_merged_grades(path, seed, students=30):
+    """Random grade rows, students interleaved across the file"""
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(students * 8):
+        user_id = 5000 + rng.randrange(students)
+        year = rng.choice([2021, 2022, 2023])
+        rows.append(
+            {
+                "User ID": user_id,
+                "First Name": f"First{user_id}",
+                "Last Name": f"Last{user_id}",
+                "Academic Year": f"{year} - {year + 1}",
+                "Course Code": f"C{rng.randrange(20)}",
+                "Course Title": "Course",
+                "Grade Earned": rng.choice(GRADES),
+                "Credit Earned": rng.choice(CREDITS),
+                "Weight": rng.choice(WEIGHTS),
+                "CORE": rng.choice(["Yes", "No"]),
+                # Extra export column the loader skips
+                "Teacher": "Teacher",
+            }
+        )
+    pd.DataFrame(rows).to_csv(path, index=False)
+    return path
+
+
+def pandas_totals(csv_path, weighted, core_only):
+    """Per-student sums the row-by-row way, indexed by User ID"""
+    df = pd.read_csv(csv_path, dtype=str, keep_default_na=False)
+    points = df["Grade Earned"].map(
+        lambda grade: MergedGPACalculator.GRADE_POINTS.get(grade.strip().upper(), 0.0)
+    )
+    credits = pd.to_numeric(df["Credit Earned"], errors="coerce").fillna(0.0)
+    weights = pd.to_numeric(df["Weight"], errors="coerce").fillna(0.0)
+    in_gpa = (df["CORE"] == "Yes") | (not core_only)
+    gpa_credits = credits.where(in_gpa, 0.0)
+
+    totals = pd.DataFrame(
+        {
+            "User ID": df["User ID"].astype(int),
+            "gpa_points": ((points + weights) if weighted else points) * gpa_credits,
+            "gpa_credits": gpa_credits,
+            "credits_attempted": credits,
+            "credits_earned": credits.where(points > 0.0, 0.0),
+        }
+    )
+    return totals.groupby("User ID", sort=False).sum()
+
+
+@pytest.fixture(params=range(3))
+def merged_csv(request, tmp_path):
+    return write_merged_grades(tmp_path / "Merged_Grades.csv", request.param)
+
+
+@pytest.mark.parametrize("weighted", [True, False])
+@pytest.mark.parametrize("core_only", [True, False])
+def test_student_totals_match_pandas(merged_csv, weighted, core_only):
+    """One student's fused sums equal the groupby sums"""
+    calculator = MergedGPACalculator(str(merged_csv))
+    expected = pandas_totals(merged_csv, weighted, core_only)
+
+    for user_id, rows in calculator._rows_by_user.items():
+        totals = _student_totals(
+            calculator._grade_codes[rows],
+            calculator._points_lut,
+            calculator._credits[rows],
+            calculator._weights[rows],
+            calculator._is_core[rows],
+            calculator._passing[rows],
+            weighted,
+            core_only,
+        )
+        assert totals == pytest.approx(tuple(expected.loc[user_id]), abs=1e-9)
+
+        gpa_points, gpa_credits, attempted, earned = expected.loc[user_id]
+        gpa = gpa_points / gpa_credits if gpa_credits > 0 else 0.0
+        assert calculator.calculate_gpa(
+            user_id, weighted=weighted, core_only=core_only
+        ) == pytest.approx((gpa, attempted, earned), abs=1e-6)
+
+
+@pytest.mark.parametrize("weighted", [True, False])
+@pytest.mark.parametrize("core_only", [True, False])
+def test_roster_totals_match_pandas(merged_csv, weighted, core_only):
+    """The CSR roster pass returns every student's groupby sums, in order"""
+    calculator = MergedGPACalculator(str(merged_csv))
+    expected = pandas_totals(merged_csv, weighted, core_only)
+    order = calculator._row_order
+
+    totals = _roster_totals(
+        calculator._student_offsets,
+        calculator._grade_codes[order],
+        calculator._points_lut,
+        calculator._credits[order],
+        calculator._weights[order],
+        calculator._is_core[order],
+        calculator._passing[order],
+        weighted,
+        core_only,
+    )
+
+    assert list(calculator._student_ids) == list(expected.index)
+    np.testing.assert_allclose(totals, expected.to_numpy(), atol=1e-9)
+
+
+@pytest.mark.parametrize("weighted", [True, False])
+def test_calculate_all_students_matches_cumulative_gpa(merged_csv, weighted):
+    """The roster report agrees with the per-student cumulative GPA"""
+    calculator = MergedGPACalculator(str(merged_csv))
+
+    results = calculator.calculate_all_students(weighted=weighted)
+
+    assert sorted(results["User ID"]) == sorted(calculator._rows_by_user)
+    assert results["Cumulative GPA"].is_monotonic_decreasing
+    for row in results.itertuples(index=False):
+        cumulative = calculator.calculate_cumulative_gpa(row[0], weighted=weighted)
+        assert (row[3], row[4], row[5]) == pytest.approx(
+            (
+                cumulative["gpa"],
+                cumulative["credits_attempted"],
+                cumulative["credits_earned"],
+            ),
+            abs=1e-6,
+        )
+
+
+@pytest.mark.parametrize("weighted", [True, False])
+def test_polars_backend_matches_pandas(merged_csv, weighted):
+    """backend='polars' reports the same students, GPAs and credits"""
+    pytest.importorskip("polars")
+    calculator = MergedGPACalculator(str(merged_csv))
+
+    expected = calculator.calculate_all_students(weighted=weighted)
+    results = calculator.calculate_all_students(weighted=weighted, backend="polars")
+
+    assert list(results.columns) == list(expected.columns)
+    pd.testing.assert_frame_equal(
+        results.set_index("User ID").sort_index(),
+        expected.set_index("User ID").sort_index(),
+        check_dtype=False,
+        atol=1e-6,
+    )
+
+
+def test_unknown_backend_rejected(merged_csv):
+    """Anything but pandas/polars is a ValueError"""
+    calculator = MergedGPACalculator(str(merged_csv))
+
+    with pytest.raises(ValueError):
+        calculator.calculate_all_students(backend="spark")
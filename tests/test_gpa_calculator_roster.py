@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+ROSTER GPA TESTS - Whole-class GPA helpers agree with the per-student path
+Synthetic rosters, no CSV exports needed
+
+COVERAGE:
+✅ calculate_gpas_batch() matches calculate_student_gpa() for every student
+✅ precompute_class_ranks() ranks ties like calculate_class_rank()
+
+Priority: HIGH - Bulk runs must report the same GPAs as single transcripts
+"""
+
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from gpa_calculator import GPACalculator
+from data_models import CourseGrade, CourseWeight, TransferGrade
+
+GRADES = ["A", "A-", "B+", "B", "C", "D", "F", "P", "W", "92", "78.5", "55", ""]
+
+
+def build_weight_index():
+    """Regular, Honors, AP and non-CORE courses (codes C0-C11)"""
+    weights = {}
+    for i in range(12):
+        weights[f"C{i}"] = CourseWeight(
+            course_id=i,
+            course_code=f"C{i}",
+            course_title=f"Course {i}",
+            core=i % 4 != 3,
+            weight=(0.0, 0.5, 1.0)[i % 3],
+            credit=(1.0, 0.5)[i % 2],
+        )
+    return weights
+
+
+def build_roster(seed, students=25):
+    """Random school and transfer grades, keyed by student ID"""
+    rng = random.Random(seed)
+    school_grades = {}
+    transfer_grades = {}
+    for student_id in range(1000, 1000 + students):
+        grades = []
+        # Some students have nothing graded yet
+        for _ in range(rng.choice([0, 3, 8, 14])):
+            year = rng.choice([2021, 2022, 2023])
+            grades.append(
+                CourseGrade(
+                    user_id=student_id,
+                    first_name="Test",
+                    last_name="Student",
+                    grad_year=2025,
+                    school_year=f"{year} - {year + 1}",
+                    # C12 is missing from the weight index
+                    course_code=f"C{rng.randrange(13)}",
+                    course_title="Course",
+                    course_part_number=rng.choice(["1", "2"]),
+                    term_name="Semester",
+                    grade=rng.choice(GRADES),
+                    credits_attempted=rng.choice([None, "0.5", "1.0"]),
+                )
+            )
+        school_grades[student_id] = grades
+
+        if rng.random() < 0.4:
+            transfer_grades[student_id] = [
+                TransferGrade(
+                    user_id=student_id,
+                    first_name="Test",
+                    last_name="Student",
+                    school_year="2020 - 2021",
+                    course_code=f"C{rng.randrange(13)}",
+                    course_title="Transfer Course",
+                    grade=rng.choice(GRADES[:8]),
+                    credits_attempted=rng.choice(["0.5", "1.0"]),
+                )
+                for _ in range(rng.randint(1, 4))
+            ]
+    return school_grades, transfer_grades
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("include_transfer", [True, False])
+def test_calculate_gpas_batch_matches_student_gpa(seed, include_transfer):
+    """Every batch GPA equals the single-student calculation"""
+    calculator = GPACalculator(build_weight_index())
+    school_grades, transfer_grades = build_roster(seed)
+
+    batch = calculator.calculate_gpas_batch(
+        school_grades, include_transfer, transfer_grades
+    )
+
+    assert list(batch) == list(school_grades)
+    for student_id, grades in school_grades.items():
+        single = calculator.calculate_student_gpa(
+            student_id, grades, include_transfer, transfer_grades.get(student_id)
+        )
+        assert batch[student_id] == pytest.approx(
+            (
+                single.weighted_gpa,
+                single.unweighted_gpa,
+                single.core_weighted_gpa,
+                single.core_unweighted_gpa,
+            ),
+            abs=1e-9,
+        )
+
+
+def test_calculate_gpas_batch_empty_roster():
+    """No students, no results"""
+    assert GPACalculator(build_weight_index()).calculate_gpas_batch({}) == {}
+
+
+def test_precompute_class_ranks_ties_share_best_rank():
+    """Equal GPAs share a rank and the next GPA skips ahead"""
+    calculator = GPACalculator({})
+    class_gpas = [(1, 3.5), (2, 4.0), (3, 3.5), (4, 3.9), (5, 4.0), (6, 2.0)]
+
+    ranks = calculator.precompute_class_ranks(class_gpas)
+
+    assert {sid: rank for sid, (rank, _, _) in ranks.items()} == {
+        2: 1,
+        5: 1,
+        4: 3,
+        1: 4,
+        3: 4,
+        6: 6,
+    }
+    assert all(total == 6 for _, total, _ in ranks.values())
+    assert ranks[2][2] == "Top 20%"
+    assert ranks[6][2] == "Rank 6 of 6"
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_precompute_class_ranks_matches_calculate_class_rank(seed):
+    """The single-sort ranks equal the per-student rank for every student"""
+    rng = random.Random(seed)
+    calculator = GPACalculator({})
+    # Few distinct GPAs, so most students tie with someone
+    class_gpas = [
+        (student_id, rng.choice([2.5, 3.0, 3.25, 3.5, 4.0, 4.5]))
+        for student_id in range(rng.randint(1, 60))
+    ]
+
+    ranks = calculator.precompute_class_ranks(class_gpas)
+
+    assert list(ranks) == [student_id for student_id, _ in class_gpas]
+    for student_id, gpa in class_gpas:
+        assert ranks[student_id] == calculator.calculate_class_rank(gpa, class_gpas)
+
+
+def test_precompute_class_ranks_empty_class():
+    """No students, no ranks"""
+    assert GPACalculator({}).precompute_class_ranks([]) == {}
@@ -289,7 +289,7 @@ class TestGPACalculator:
 
     def test_calculation_log(self, sample_course_weights, sample_grades):
         """Test that calculation log is populated"""
-        calculator = GPACalculator(sample_course_weights)
+        calculator = GPACalculator(sample_course_weights, log_enabled=True)
         calculator.calculate_student_gpa(1001, sample_grades)
 
         log = calculator.get_calculation_log()